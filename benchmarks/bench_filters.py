@@ -0,0 +1,107 @@
+"""Compiled ext.filters vs the previous closure chain, and indexed vs scanned waiters.
+
+    python benchmarks/bench_filters.py
+"""
+import sys
+from asyncio import new_event_loop, set_event_loop
+from os import path
+from timeit import repeat
+from types import SimpleNamespace
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from discord_components.ext.filters import (  # noqa: E402
+    message_filter,
+    user_filter,
+    component_filter,
+    channel_filter,
+)
+from discord_components.waiters import WaiterIndex  # noqa: E402
+
+
+def closure_chain(message, user, component, channel):
+    # what wait_for built before filters were composable
+    def _message(interaction):
+        if isinstance(interaction.message, dict):
+            return False
+        return interaction.message.id == message.id
+
+    def _user(interaction):
+        return interaction.user.id == user.id
+
+    def _component(interaction):
+        return interaction.custom_id == component.id
+
+    def _channel(interaction):
+        return interaction.channel_id == channel.id
+
+    check_list = [_message, _user, _component, _channel]
+
+    def check(interaction):
+        for i in check_list:
+            if not i(interaction):
+                return False
+        return True
+
+    return check
+
+
+def interaction(message_id, user_id, custom_id="btn", channel_id=3):
+    return SimpleNamespace(
+        message=SimpleNamespace(id=message_id),
+        user=SimpleNamespace(id=user_id),
+        custom_id=custom_id,
+        channel_id=channel_id,
+        guild_id=None,
+    )
+
+
+def best(stmt, number):
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    message, user = SimpleNamespace(id=1), SimpleNamespace(id=2)
+    component, channel = SimpleNamespace(id="btn"), SimpleNamespace(id=3)
+    hit, miss = interaction(1, 2), interaction(1, 9)
+
+    old = closure_chain(message, user, component, channel)
+    new = (
+        message_filter(message)
+        & user_filter(user)
+        & component_filter(component)
+        & channel_filter(channel)
+    ).compile()
+
+    print("predicate (ns/call)")
+    for name, check in (("closure chain", old), ("compiled filter", new)):
+        hit_ns = best(lambda: check(hit), 200000)
+        miss_ns = best(lambda: check(miss), 200000)
+        print(f"  {name:<16} hit {hit_ns:7.1f}  miss {miss_ns:7.1f}")
+
+    print("click matching none of N pending waiters (us/click)")
+    set_event_loop(new_event_loop())
+    for n in (10, 1000, 10000):
+        checks = [
+            closure_chain(SimpleNamespace(id=i), user, component, channel) for i in range(n)
+        ]
+        index = WaiterIndex()
+        for i in range(n):
+            index.add("button_click", message_filter(SimpleNamespace(id=i)) & user_filter(user))
+
+        click = interaction(n + 1, 2)
+
+        def scan():
+            for check in checks:
+                check(click)
+
+        def resolve():
+            index.resolve("button_click", click)
+
+        scan_us = best(scan, 20) / 1000
+        index_us = best(resolve, 20000) / 1000
+        print(f"  N={n:<6} scan {scan_us:9.2f}  index {index_us:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""A local stand-in for the parts of discord's gateway and REST API the library touches.
+
+It speaks HELLO / IDENTIFY / READY / heartbeats / RESUME on the gateway, dispatches
+whatever events it is told to, and answers interaction callbacks, webhook message edits
+and channel message sends/edits with per-bucket rate limit headers and 429s. Every
+interaction callback is timestamped so load tests can measure response latency.
+
+inject() queues failures for the next requests to a route; like discord, editing the
+@original message of an interaction that was never acknowledged is a 404.
+"""
+import json
+import random
+from asyncio import sleep
+from collections import defaultdict, deque
+from itertools import count
+from time import monotonic, time
+
+from aiohttp import web, WSMsgType
+
+import payloads
+
+
+API = "/api/v7"
+
+DEFAULT_LIMITS = {
+    "interaction_callback": None,
+    "webhook_message": (5, 2.0),
+    "channel_message": (5, 5.0),
+}
+
+
+class _Bucket:
+    __slots__ = ("limit", "per", "hits")
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.hits = []
+
+    def take(self, now: float):
+        self.hits = [hit for hit in self.hits if now - hit < self.per]
+        if len(self.hits) >= self.limit:
+            return False, self.hits[0] + self.per - now
+        self.hits.append(now)
+        return True, (self.hits[0] + self.per - now)
+
+
+class FakeDiscord:
+    def __init__(
+        self,
+        *,
+        limits: dict = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        heartbeat_interval: float = 41.25,
+    ):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.heartbeat_interval = heartbeat_interval
+
+        self.user = payloads.user_payload(payloads.APPLICATION_ID, bot=True)
+        self.sockets = []
+        self.identified = 0
+        self._seq = count(1)
+        self._buckets = {}
+
+        self.dispatched = {}
+        self.callbacks = {}
+        self.acknowledged = set()
+        self.faults = defaultdict(deque)
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+
+        self.app = web.Application()
+        self.app.add_routes(
+            [
+                web.get(API + "/users/@me", self.get_me),
+                web.get(API + "/gateway", self.get_gateway),
+                web.get(API + "/gateway/bot", self.get_gateway),
+                web.get("/gateway", self.gateway),
+                web.post(API + "/interactions/{id}/{token}/callback", self.interaction_callback),
+                web.patch(
+                    API + "/webhooks/{application_id}/{token}/messages/{message_id}",
+                    self.webhook_message,
+                ),
+                web.post(API + "/webhooks/{application_id}/{token}", self.webhook_message),
+                web.post(API + "/channels/{channel_id}/messages", self.channel_message),
+                web.patch(
+                    API + "/channels/{channel_id}/messages/{message_id}", self.channel_message
+                ),
+            ]
+        )
+        self._runner = None
+        self.url = None
+        self.hang = 10.0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def close(self):
+        for ws in list(self.sockets):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def inject(self, route: str, *faults: str, hang: float = 10.0):
+        # one fault per upcoming request to `route` ("interaction_callback", "webhook_message"
+        # or "channel_message"):
+        #   "503"       answer 503 without handling the request
+        #   "reset"     drop the connection without handling the request
+        #   "ack-reset" handle the request, then drop the connection instead of answering
+        #   "ack-hang"  handle the request, then answer only after `hang` seconds
+        self.hang = hang
+        self.faults[route].extend(faults)
+
+    def _fault(self, route: str):
+        faults = self.faults.get(route)
+        return faults.popleft() if faults else None
+
+    # gateway
+
+    async def _send(self, ws, op: int, data=None, event: str = None):
+        payload = {"op": op, "d": data, "s": None, "t": event}
+        if op == 0:
+            payload["s"] = next(self._seq)
+        await ws.send_str(json.dumps(payload))
+
+    async def dispatch(self, event: str, data: dict):
+        if event == "INTERACTION_CREATE":
+            self.dispatched[data["id"]] = monotonic()
+        for ws in list(self.sockets):
+            if not ws.closed:
+                await self._send(ws, 0, data, event)
+
+    async def dispatch_interaction(self, data: dict):
+        await self.dispatch("INTERACTION_CREATE", data)
+
+    async def gateway(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await self._send(ws, 10, {"heartbeat_interval": int(self.heartbeat_interval * 1000)})
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+
+            payload = json.loads(message.data)
+            op = payload["op"]
+            if op == 1:
+                await self._send(ws, 11)
+            elif op == 2:
+                self.identified += 1
+                self.sockets.append(ws)
+                await self._send(
+                    ws,
+                    0,
+                    {
+                        "v": 6,
+                        "user": self.user,
+                        "guilds": [],
+                        "private_channels": [],
+                        "session_id": f"session-{self.identified}",
+                        "application": {"id": self.user["id"], "flags": 0},
+                    },
+                    "READY",
+                )
+            elif op == 6:
+                self.sockets.append(ws)
+                await self._send(ws, 0, {}, "RESUMED")
+
+        if ws in self.sockets:
+            self.sockets.remove(ws)
+        return ws
+
+    # rest
+
+    async def get_me(self, request):
+        return self._json(self.user)
+
+    async def get_gateway(self, request):
+        url = f"ws://{request.host}/gateway"
+        return self._json({"url": url, "shards": 1, "session_start_limit": {"remaining": 1000}})
+
+    def _json(self, data, status: int = 200, headers: dict = None):
+        return web.Response(
+            body=json.dumps(data).encode(),
+            status=status,
+            headers={"Content-Type": "application/json", **(headers or {})},
+        )
+
+    async def _limited(self, name: str, major: str):
+        self.requests += 1
+        if self.latency:
+            await sleep(self.latency)
+
+        if self.error_rate and random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503, text="upstream connect error")
+
+        limit = self.limits.get(name)
+        if limit is None:
+            return None
+
+        bucket = self._buckets.get((name, major))
+        if bucket is None:
+            bucket = self._buckets[(name, major)] = _Bucket(*limit)
+
+        allowed, reset_after = bucket.take(monotonic())
+        headers = {
+            "X-RateLimit-Limit": str(bucket.limit),
+            "X-RateLimit-Remaining": str(bucket.limit - len(bucket.hits)),
+            "X-RateLimit-Reset": f"{time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": f"{name}:{major}",
+        }
+        if allowed:
+            return headers
+
+        self.rate_limited += 1
+        return self._json(
+            {
+                "message": "You are being rate limited.",
+                "retry_after": reset_after * 1000,
+                "global": False,
+            },
+            status=429,
+            headers={**headers, "Via": "1.1 google", "Retry-After": f"{reset_after:.3f}"},
+        )
+
+    def _message(self, request, data: dict, message_id: str = None):
+        message = payloads.message_payload(message_id=message_id, rows=0)
+        message.update(
+            {k: v for k, v in data.items() if k in ("content", "embeds", "components", "flags")}
+        )
+        message["channel_id"] = request.match_info.get("channel_id", message["channel_id"])
+        return message
+
+    async def _body(self, request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json()
+        form = await request.post()
+        return json.loads(form.get("payload_json", "{}"))
+
+    async def _answer(self, request, fault: str, response):
+        if fault == "ack-reset":
+            request.transport.abort()
+            await sleep(self.hang)
+        elif fault == "ack-hang":
+            await sleep(self.hang)
+        return response
+
+    async def interaction_callback(self, request):
+        fault = self._fault("interaction_callback")
+        if fault == "503":
+            self.errors += 1
+            return web.Response(status=503, text="upstream connect error")
+        if fault == "reset":
+            request.transport.abort()
+            await sleep(self.hang)
+
+        interaction_id = request.match_info["id"]
+        if interaction_id in self.callbacks:
+            return self._json(
+                {"code": 40060, "message": "Interaction has already been acknowledged."}, 400
+            )
+
+        result = await self._limited("interaction_callback", request.match_info["token"])
+        if isinstance(result, web.Response):
+            return result
+
+        await self._body(request)
+        self.callbacks[interaction_id] = monotonic()
+        self.acknowledged.add(request.match_info["token"])
+        return await self._answer(request, fault, web.Response(status=204, headers=result or {}))
+
+    async def webhook_message(self, request):
+        fault = self._fault("webhook_message")
+        if fault == "503":
+            self.errors += 1
+            return web.Response(status=503, text="upstream connect error")
+
+        if (
+            request.match_info.get("message_id") == "@original"
+            and request.match_info["token"] not in self.acknowledged
+        ):
+            return self._json({"code": 10015, "message": "Unknown Webhook"}, 404)
+
+        result = await self._limited("webhook_message", request.match_info["token"])
+        if isinstance(result, web.Response):
+            return result
+
+        data = await self._body(request)
+        message_id = request.match_info.get("message_id")
+        message = self._message(request, data, None if message_id == "@original" else message_id)
+        return self._json(message, headers=result)
+
+    async def channel_message(self, request):
+        result = await self._limited("channel_message", request.match_info["channel_id"])
+        if isinstance(result, web.Response):
+            return result
+
+        data = await self._body(request)
+        return self._json(
+            self._message(request, data, request.match_info.get("message_id")), headers=result
+        )
@@ -0,0 +1,103 @@
+"""A small pyperf-style runner: calibrated loops, warmup, repeated samples, JSON results."""
+import json
+import platform
+import subprocess
+from asyncio import iscoroutinefunction
+from datetime import datetime, timezone
+from statistics import mean, median, stdev
+from time import perf_counter
+
+
+def _time_sync(func, loops: int) -> float:
+    started = perf_counter()
+    for _ in range(loops):
+        func()
+    return perf_counter() - started
+
+
+async def _time_async(func, loops: int) -> float:
+    started = perf_counter()
+    for _ in range(loops):
+        await func()
+    return perf_counter() - started
+
+
+class Runner:
+    def __init__(self, *, samples: int = 10, min_time: float = 0.05, loop=None):
+        self.samples = samples
+        self.min_time = min_time
+        self.loop = loop
+        self.results = {}
+
+    def _time(self, func, loops: int) -> float:
+        if iscoroutinefunction(func):
+            return self.loop.run_until_complete(_time_async(func, loops))
+        return _time_sync(func, loops)
+
+    def bench(self, name: str, func):
+        loops = 1
+        while True:
+            elapsed = self._time(func, loops)
+            if elapsed >= self.min_time or loops >= 1 << 24:
+                break
+            loops *= 2 if elapsed < self.min_time / 4 else max(2, int(self.min_time / elapsed))
+
+        timings = [self._time(func, loops) / loops * 1e9 for _ in range(self.samples)]
+        result = {
+            "loops": loops,
+            "mean": mean(timings),
+            "median": median(timings),
+            "stdev": stdev(timings) if len(timings) > 1 else 0.0,
+            "min": min(timings),
+        }
+        self.results[name] = result
+        print(f"{name:<58} {result['median']:>12.1f} ns  +- {result['stdev']:.1f}")
+        return result
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(), "benchmarks": self.results}, f, indent=2)
+
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compare(base_path: str, new_path: str, threshold: float = 0.05) -> int:
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"base {base['meta'].get('commit')}  new {new['meta'].get('commit')}")
+    regressions = 0
+    for name, result in new["benchmarks"].items():
+        old = base["benchmarks"].get(name)
+        if old is None:
+            print(f"{name:<58} {'new':>10}")
+            continue
+
+        ratio = result["median"] / old["median"]
+        noise = (result["stdev"] + old["stdev"]) / old["median"]
+        if abs(ratio - 1) <= max(threshold, noise):
+            verdict = "same"
+        elif ratio < 1:
+            verdict = f"{1 / ratio:.2f}x faster"
+        else:
+            verdict = f"{ratio:.2f}x slower"
+            regressions += 1
+        print(f"{name:<58} {old['median']:>10.1f} -> {result['median']:>10.1f} ns  {verdict}")
+    return regressions
@@ -0,0 +1,80 @@
+"""Measure cold import cost of discord_components with `python -X importtime`.
+
+    python benchmarks/importtime.py                # median of 5 fresh interpreters per case
+    python benchmarks/importtime.py -n 10 --top 15
+
+Each case runs in a new interpreter, so nothing is cached in sys.modules. Reports the
+cumulative import time of the statement and the slowest modules it pulled in, and checks
+that importing leaves discord.py unpatched.
+"""
+import subprocess
+import sys
+from argparse import ArgumentParser
+from os import path
+from statistics import median
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+CASES = {
+    "package": "import discord_components",
+    "components": "from discord_components import Button, Select, ActionRow",
+    "client": "from discord_components import DiscordComponents",
+    "everything": "from discord_components import *",
+    "discord (baseline)": "import discord",
+}
+
+SIDE_EFFECTS = """
+import discord, discord.abc, discord.http
+before = (discord.abc.Messageable.send, discord.http.HTTPClient.send_message)
+from discord_components import *
+after = (discord.abc.Messageable.send, discord.http.HTTPClient.send_message)
+assert before == after, "importing discord_components patched discord.py"
+"""
+
+
+def importtime(statement: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            own, cumulative, name = line[len("import time:") :].split("|")
+            # nesting is shown by indenting the name two spaces per level
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            modules[name.strip()] = (int(own), int(cumulative), depth)
+        except ValueError:
+            continue
+    return modules
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest modules to list per case")
+    args = parser.parse_args()
+
+    for case, statement in CASES.items():
+        runs = [importtime(statement) for _ in range(args.runs)]
+        totals = [
+            sum(cumulative for _, cumulative, depth in modules.values() if depth == 0)
+            for modules in runs
+        ]
+        print(f"{case:<20} {median(totals) / 1000:8.1f} ms  {len(runs[0]):4} modules  {statement}")
+
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)
+        for name, (own, _, _) in slowest[: args.top]:
+            print(f"    {own / 1000:8.1f} ms  {name}")
+
+    subprocess.run([sys.executable, "-c", SIDE_EFFECTS], cwd=ROOT, check=True)
+    print("import is side-effect free")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Drive a ComponentsBot end to end against benchmarks/fake_discord.py.
+
+    python benchmarks/loadgen.py --rate 500 --duration 10 --mode edit
+    python benchmarks/loadgen.py --rate 2000 --latency 0.05 --error-rate 0.01
+
+Reports clicks/sec acknowledged, response latency percentiles (dispatch on the fake
+gateway to the interaction callback arriving at the fake REST API) and missed deadlines.
+"""
+import sys
+import warnings
+from argparse import ArgumentParser
+from asyncio import ensure_future, new_event_loop, set_event_loop, sleep, wait_for
+from os import path
+from time import monotonic
+
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from discord.http import Route  # noqa: E402
+
+from discord_components import ComponentsBot, Button  # noqa: E402
+from discord_components.const import INTERACTION_RESPONSE_TIMEOUT  # noqa: E402
+
+import payloads  # noqa: E402
+from fake_discord import FakeDiscord  # noqa: E402
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def make_bot(mode: str) -> ComponentsBot:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        bot = ComponentsBot("!")
+
+    async def callback(interaction):
+        if mode == "defer":
+            await interaction.defer(edit_origin=True)
+        elif mode == "edit":
+            await interaction.edit_origin(content=f"clicked by {interaction.user.id}")
+        else:
+            await interaction.respond(content="clicked")
+
+    bot.components_manager.add_callback(Button(label="load", custom_id="load"), callback)
+    return bot
+
+
+async def run(args) -> dict:
+    server = FakeDiscord(latency=args.latency, error_rate=args.error_rate)
+    Route.BASE = await server.start() + "/api/v7"
+
+    bot = make_bot(args.mode)
+    bot_task = ensure_future(bot.start("fake-token"))
+    await wait_for(bot.wait_until_ready(), 30)
+
+    row = {"type": 1, "components": [payloads.button_payload("load")]}
+    messages = [
+        dict(payloads.message_payload(rows=0), components=[row]) for _ in range(args.messages)
+    ]
+
+    total = int(args.rate * args.duration)
+    interval = 1 / args.rate
+    started = monotonic()
+    for i in range(total):
+        delay = started + i * interval - monotonic()
+        if delay > 0:
+            await sleep(delay)
+        await server.dispatch_interaction(
+            payloads.interaction_payload(
+                message=messages[i % len(messages)],
+                custom_id="load",
+                user_id=payloads.APPLICATION_ID + 1 + i % args.users,
+            )
+        )
+    sent_elapsed = monotonic() - started
+
+    deadline = monotonic() + INTERACTION_RESPONSE_TIMEOUT + 1
+    while len(server.callbacks) < total and monotonic() < deadline:
+        await sleep(0.05)
+    finished = max(server.callbacks.values(), default=monotonic())
+
+    latencies = sorted(
+        server.callbacks[i] - sent_at
+        for i, sent_at in server.dispatched.items()
+        if i in server.callbacks
+    )
+    missed = sum(
+        1
+        for i in server.dispatched
+        if i not in server.callbacks
+        or server.callbacks[i] - server.dispatched[i] > INTERACTION_RESPONSE_TIMEOUT
+    )
+
+    await bot.close()
+    bot_task.cancel()
+    await server.close()
+
+    return {
+        "clicks": total,
+        "offered_rate": total / sent_elapsed,
+        "acked": len(latencies),
+        "acked_per_second": len(latencies) / max(finished - started, 1e-9),
+        "p50_ms": (percentile(latencies, 50) or 0) * 1000,
+        "p90_ms": (percentile(latencies, 90) or 0) * 1000,
+        "p99_ms": (percentile(latencies, 99) or 0) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0) * 1000,
+        "missed_deadlines": missed,
+        "rest_requests": server.requests,
+        "rate_limited": server.rate_limited,
+        "injected_errors": server.errors,
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=200, help="clicks per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of load")
+    parser.add_argument("--messages", type=int, default=100, help="distinct messages clicked")
+    parser.add_argument("--users", type=int, default=1000, help="distinct users clicking")
+    parser.add_argument("--mode", choices=("defer", "edit", "send"), default="defer")
+    parser.add_argument("--latency", type=float, default=0.0, help="added REST latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503s")
+    args = parser.parse_args()
+
+    loop = new_event_loop()
+    set_event_loop(loop)
+    report = loop.run_until_complete(run(args))
+    for key, value in report.items():
+        print(f"{key:<18} {value:.1f}" if isinstance(value, float) else f"{key:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
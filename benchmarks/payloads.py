@@ -0,0 +1,143 @@
+"""Synthetic gateway payloads shaped like what discord sends for component messages."""
+from itertools import count
+
+
+APPLICATION_ID = 420000000000000000
+CHANNEL_ID = 430000000000000000
+GUILD_ID = 440000000000000000
+
+_snowflakes = count(((1609459200000 - 1420070400000) << 22))
+
+
+def snowflake() -> str:
+    return str(next(_snowflakes))
+
+
+def user_payload(user_id: int = 450000000000000000, *, bot: bool = False) -> dict:
+    return {
+        "id": str(user_id),
+        "username": "bot" if bot else "user",
+        "discriminator": "0001",
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int = 450000000000000000) -> dict:
+    return {
+        "user": user_payload(user_id),
+        "roles": [],
+        "nick": None,
+        "joined_at": "2021-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "permissions": "2147483647",
+    }
+
+
+def button_payload(custom_id: str, *, emoji: bool = False) -> dict:
+    data = {"type": 2, "style": 1, "label": custom_id, "custom_id": custom_id}
+    if emoji:
+        data["emoji"] = {"name": "thonk", "id": "460000000000000000", "animated": False}
+    return data
+
+
+def select_payload(custom_id: str, options: int, *, emoji: bool = False) -> dict:
+    return {
+        "type": 3,
+        "custom_id": custom_id,
+        "placeholder": "Pick one",
+        "min_values": 1,
+        "max_values": 1,
+        "options": [
+            {
+                "label": f"Option {i}",
+                "value": str(i),
+                "description": f"Description {i}",
+                "default": i == 0,
+                **({"emoji": {"name": "🔥"}} if emoji else {}),
+            }
+            for i in range(options)
+        ],
+    }
+
+
+def components_payload(rows: int = 1, *, buttons: int = 5, select: int = 0, emoji: bool = False):
+    result = []
+    for row in range(rows):
+        if select and row == 0:
+            components = [select_payload("select", select, emoji=emoji)]
+        else:
+            components = [
+                button_payload(f"button_{row}_{i}", emoji=emoji) for i in range(buttons)
+            ]
+        result.append({"type": 1, "components": components})
+    return result
+
+
+def message_payload(
+    *,
+    message_id: str = None,
+    rows: int = 1,
+    buttons: int = 5,
+    select: int = 0,
+    emoji: bool = False,
+    guild: bool = True,
+    ephemeral: bool = False,
+) -> dict:
+    data = {
+        "id": message_id or snowflake(),
+        "channel_id": str(CHANNEL_ID),
+        "type": 0,
+        "content": "Pick something",
+        "author": user_payload(APPLICATION_ID, bot=True),
+        "attachments": [],
+        "embeds": [{"type": "rich", "title": "Menu", "description": "x" * 200}],
+        "mentions": [],
+        "mention_roles": [],
+        "pinned": False,
+        "mention_everyone": False,
+        "tts": False,
+        "timestamp": "2021-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "flags": 64 if ephemeral else 0,
+        "components": components_payload(rows, buttons=buttons, select=select, emoji=emoji),
+    }
+    if guild:
+        data["guild_id"] = str(GUILD_ID)
+    return data
+
+
+def interaction_payload(
+    *,
+    message: dict = None,
+    custom_id: str = "button_0_0",
+    values: list = None,
+    user_id: int = 450000000000000000,
+    guild: bool = True,
+    **message_options,
+) -> dict:
+    message = message or message_payload(guild=guild, **message_options)
+    interaction_id = snowflake()
+    data = {
+        "id": interaction_id,
+        "application_id": str(APPLICATION_ID),
+        "type": 3,
+        "token": "aW50ZXJhY3Rpb246" + interaction_id + "x" * 130,
+        "version": 1,
+        "channel_id": str(CHANNEL_ID),
+        "message": message,
+        "data": {"custom_id": custom_id, "component_type": 3 if values else 2},
+    }
+    if values:
+        data["data"]["values"] = values
+    if guild:
+        data["guild_id"] = str(GUILD_ID)
+        data["member"] = member_payload(user_id)
+    else:
+        data["user"] = user_payload(user_id)
+    return data
+
+
+def gateway_event(data: dict, event: str = "INTERACTION_CREATE", seq: int = 1) -> dict:
+    return {"op": 0, "t": event, "s": seq, "d": data}
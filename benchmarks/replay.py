@@ -0,0 +1,139 @@
+"""Replay a recorded stream of interactions into DiscordComponents with HTTP stubbed out.
+
+    python benchmarks/replay.py traffic.rec                  # original pacing
+    python benchmarks/replay.py traffic.rec --speed 10       # ten times faster
+    python benchmarks/replay.py traffic.rec --speed 0        # as fast as possible
+    python benchmarks/replay.py --synthesize traffic.rec --count 5000 --rate 500
+
+Recordings come from discord_components.InteractionRecorder. Every custom_id seen in the
+recording gets a callback that answers the way --respond says; the stubbed HTTP layer
+timestamps each interaction callback so latency is measured from feed to acknowledgement.
+"""
+import sys
+from argparse import ArgumentParser
+from asyncio import ensure_future, gather, new_event_loop, set_event_loop, sleep
+from os import path
+from time import monotonic
+
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from discord_components import Button, InteractionRecorder, read_recording  # noqa: E402
+
+import payloads  # noqa: E402
+from loadgen import percentile  # noqa: E402
+from run import make_manager  # noqa: E402
+
+
+def synthesize(file: str, count: int, rate: float, messages: int = 100, users: int = 1000):
+    shapes = [payloads.message_payload(rows=1 + i % 3) for i in range(messages)]
+    with InteractionRecorder(file, anonymize=False) as recorder:
+        for i in range(count):
+            message = shapes[i % messages]
+            raw = payloads.interaction_payload(
+                message=message,
+                custom_id=message["components"][0]["components"][i % 5]["custom_id"],
+                user_id=payloads.APPLICATION_ID + 1 + i % users,
+            )
+            recorder.record(payloads.gateway_event(raw, seq=i + 1), i / rate)
+    return recorder.records
+
+
+class StubHTTP:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.acked = {}
+        self.requests = 0
+
+    async def request(self, route, **kwargs):
+        self.requests += 1
+        if self.latency:
+            await sleep(self.latency)
+        if route.path.startswith("/interactions/"):
+            self.acked[route.path.split("/")[2]] = monotonic()
+        return None
+
+
+async def replay(records: list, *, speed: float, respond: str, latency: float) -> dict:
+    manager = make_manager()
+    http = StubHTTP(latency)
+    manager.bot.http.request = http.request
+
+    async def callback(interaction):
+        if respond == "defer":
+            await interaction.defer(edit_origin=True)
+        elif respond == "edit":
+            await interaction.edit_origin(content="replayed")
+        elif respond == "send":
+            await interaction.respond(content="replayed")
+
+    for custom_id in {res["d"]["data"]["custom_id"] for _, res in records}:
+        manager.add_callback(Button(label="replay", custom_id=custom_id), callback)
+
+    fed = {}
+    handled = []
+    tasks = []
+
+    async def feed(res: dict):
+        started = fed[res["d"]["id"]] = monotonic()
+        await manager.on_socket_response(res)
+        handled.append(monotonic() - started)
+
+    started = monotonic()
+    for offset, res in records:
+        if speed:
+            delay = started + offset / speed - monotonic()
+            if delay > 0:
+                await sleep(delay)
+        else:
+            await sleep(0)
+        tasks.append(ensure_future(feed(res)))
+    await gather(*tasks)
+    elapsed = monotonic() - started
+
+    latencies = sorted(http.acked[i] - fed[i] for i in fed if i in http.acked)
+    handled.sort()
+    return {
+        "events": len(records),
+        "recorded_seconds": records[-1][0] if records else 0.0,
+        "elapsed": elapsed,
+        "events_per_second": len(records) / max(elapsed, 1e-9),
+        "acked": len(latencies),
+        "ack_p50_us": (percentile(latencies, 50) or 0) * 1e6,
+        "ack_p90_us": (percentile(latencies, 90) or 0) * 1e6,
+        "ack_p99_us": (percentile(latencies, 99) or 0) * 1e6,
+        "ack_max_us": (latencies[-1] if latencies else 0) * 1e6,
+        "handle_p50_us": (percentile(handled, 50) or 0) * 1e6,
+        "handle_p99_us": (percentile(handled, 99) or 0) * 1e6,
+        "http_requests": http.requests,
+    }
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="0 replays without pauses")
+    parser.add_argument("--respond", choices=("defer", "edit", "send", "none"), default="defer")
+    parser.add_argument("--latency", type=float, default=0.0, help="stubbed HTTP latency (s)")
+    parser.add_argument("--synthesize", action="store_true", help="write a synthetic recording")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    if args.synthesize:
+        written = synthesize(args.recording, args.count, args.rate)
+        print(f"wrote {written} interactions to {args.recording}")
+        return
+
+    records = list(read_recording(args.recording))
+    loop = new_event_loop()
+    set_event_loop(loop)
+    report = loop.run_until_complete(
+        replay(records, speed=args.speed, respond=args.respond, latency=args.latency)
+    )
+    for key, value in report.items():
+        print(f"{key:<20} {value:.1f}" if isinstance(value, float) else f"{key:<20} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Offline microbenchmarks for the component and interaction hot paths.
+
+    python benchmarks/run.py -o base.json              # run everything, save results
+    git checkout my-branch
+    python benchmarks/run.py -o new.json --compare base.json
+    python benchmarks/run.py --compare-only base.json new.json
+    python benchmarks/run.py -k interaction --fast     # subset, fewer samples
+
+Payloads come from payloads.py; nothing here talks to discord.
+"""
+import sys
+import warnings
+from argparse import ArgumentParser
+from asyncio import new_event_loop, set_event_loop
+from fnmatch import fnmatch
+from io import BytesIO
+from os import path
+
+sys.path.insert(0, path.dirname(path.abspath(__file__)))
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+import discord  # noqa: E402
+
+from discord_components import (  # noqa: E402
+    ActionRow,
+    Button,
+    ComponentMessage,
+    DiscordComponents,
+    MessageCache,
+    Select,
+    UserCache,
+    SelectOption,
+)
+from discord_components.ext.filters import message_filter, user_filter  # noqa: E402
+from discord_components.utils import _get_components_json, _form_files  # noqa: E402
+from discord_components.waiters import WaiterIndex  # noqa: E402
+
+import payloads  # noqa: E402
+from harness import Runner, compare  # noqa: E402
+
+
+async def _no_request(route, **kwargs):
+    return None
+
+
+def make_manager(**options) -> DiscordComponents:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        client = discord.Client()
+
+    state = client._connection
+    state.user = discord.ClientUser(
+        state=state, data=payloads.user_payload(payloads.APPLICATION_ID, bot=True)
+    )
+    state._add_guild(
+        discord.Guild(
+            state=state,
+            data={
+                "id": str(payloads.GUILD_ID),
+                "name": "bench",
+                "roles": [{"id": str(payloads.GUILD_ID), "name": "@everyone", "permissions": "0"}],
+            },
+        )
+    )
+    client.http.request = _no_request
+    client.dispatch = lambda event, *args, **kwargs: None
+    return DiscordComponents(client, **options)
+
+
+SHAPES = {
+    "dm-1row": dict(guild=False, rows=1),
+    "guild-1row": dict(guild=True, rows=1),
+    "guild-5rows-emoji": dict(guild=True, rows=5, emoji=True),
+    "guild-select25": dict(guild=True, rows=1, select=25),
+}
+
+
+def bench_interaction(runner: Runner, manager: DiscordComponents):
+    for shape, options in SHAPES.items():
+        raw = payloads.interaction_payload(**options)
+        event = {"d": raw}
+        runner.bench(f"interaction_init[{shape}]", lambda: manager._get_interaction(event))
+
+
+def bench_repeat_clicks(runner: Runner, manager: DiscordComponents):
+    # the same users clicking a message the bot sent itself, with and without the caches
+    state = manager.bot._connection
+    channel = discord.Object(payloads.CHANNEL_ID)
+    for shape, options in SHAPES.items():
+        message = payloads.message_payload(**options)
+        event = {"d": payloads.interaction_payload(message=message, **options)}
+        for name, caches in (
+            ("none", {}),
+            ("message", {"message_cache": MessageCache()}),
+            ("message+user", {"message_cache": MessageCache(), "user_cache": UserCache()}),
+        ):
+            cached = make_manager(**caches)
+            if cached.message_cache is not None:
+                sent = ComponentMessage(state=state, channel=channel, data=message)
+                cached.message_cache.put(sent, message)
+            runner.bench(
+                f"repeat_click[{shape},{name}]",
+                lambda cached=cached: cached._get_interaction(event),
+            )
+
+
+def bench_message(runner: Runner, manager: DiscordComponents):
+    state = manager.bot._connection
+    channel = discord.Object(payloads.CHANNEL_ID)
+    for shape, options in SHAPES.items():
+        data = payloads.message_payload(**options)
+        runner.bench(
+            f"component_message_parse[{shape}]",
+            lambda: ComponentMessage(state=state, channel=channel, data=data),
+        )
+
+
+def bench_serialize(runner: Runner, manager: DiscordComponents):
+    buttons = [
+        ActionRow(*[Button(label=f"{r}{i}", custom_id=f"{r}{i}", emoji="🔥") for i in range(5)])
+        for r in range(5)
+    ]
+    select = [
+        ActionRow(
+            Select(
+                custom_id="select",
+                options=[SelectOption(label=str(i), value=str(i)) for i in range(25)],
+            )
+        )
+    ]
+    runner.bench("to_dict[5x5 buttons]", lambda: [row.to_dict() for row in buttons])
+    runner.bench("to_dict[select25]", lambda: [row.to_dict() for row in select])
+    runner.bench("_get_components_json[5x5 buttons]", lambda: _get_components_json(buttons))
+    runner.bench("_get_components_json[select25]", lambda: _get_components_json(select))
+
+    data = {"content": "files", "components": _get_components_json(buttons)}
+    files = [discord.File(BytesIO(b"x" * 1024), filename=f"{i}.txt") for i in range(3)]
+    runner.bench("_form_files[3x1KiB form]", lambda: _form_files(data, files))
+    runner.bench("_form_files[3x1KiB list]", lambda: _form_files(data, files, use_form=False))
+
+
+def bench_routing(runner: Runner, manager: DiscordComponents):
+    manager.dedup = None
+
+    def route(event: dict):
+        async def on_socket_response():
+            await manager.on_socket_response(event)
+
+        return on_socket_response
+
+    other = payloads.gateway_event({"content": "hi"}, event="MESSAGE_CREATE")
+    runner.bench("on_socket_response[other event]", route(other))
+
+    event = payloads.gateway_event(payloads.interaction_payload(custom_id="unrouted"))
+    runner.bench("on_socket_response[no callback]", route(event))
+
+    async def callback(interaction):
+        pass
+
+    manager.add_callback(Button(label="bench", custom_id="routed"), callback)
+    event = payloads.gateway_event(payloads.interaction_payload(custom_id="routed"))
+    runner.bench("on_socket_response[callback]", route(event))
+
+
+def bench_wait_for(runner: Runner, manager: DiscordComponents):
+    user = discord.Object(450000000000000000)
+    raw = payloads.interaction_payload()
+    interaction = manager._get_interaction({"d": raw})
+    message = discord.Object(int(raw["message"]["id"]))
+
+    for pending in (0, 1000):
+        waiters = WaiterIndex()
+        for i in range(pending):
+            waiters.add("button_click", message_filter(discord.Object(i)) & user_filter(user))
+
+        check = message_filter(message) & user_filter(user)
+
+        def resolve():
+            waiters.add("button_click", check)
+            waiters.resolve("button_click", interaction)
+
+        runner.bench(f"wait_for_resolve[pending={pending}]", resolve)
+
+
+BENCHMARKS = {
+    "interaction": bench_interaction,
+    "repeat_clicks": bench_repeat_clicks,
+    "message": bench_message,
+    "serialize": bench_serialize,
+    "routing": bench_routing,
+    "wait_for": bench_wait_for,
+}
+
+
+def main():
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-k", "--filter", default="*", help="glob over benchmark groups")
+    parser.add_argument("--fast", action="store_true", help="fewer, shorter samples")
+    parser.add_argument("--compare", metavar="BASE", help="compare against a saved run")
+    parser.add_argument("--compare-only", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare_only:
+        sys.exit(1 if compare(*args.compare_only) else 0)
+
+    loop = new_event_loop()
+    set_event_loop(loop)
+    runner = Runner(
+        samples=3 if args.fast else 10, min_time=0.01 if args.fast else 0.05, loop=loop
+    )
+    for group, bench in BENCHMARKS.items():
+        if fnmatch(group, args.filter):
+            bench(runner, make_manager())
+
+    output = args.output or (args.compare and "benchmark-results.json")
+    if output:
+        runner.dump(output)
+    if args.compare:
+        sys.exit(1 if compare(args.compare, output) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,110 @@
-from .client import *
-from .interaction import *
-from .component import *
-from .dpy_overrides import *
-from .http import *
+from importlib import import_module
+
+# submodules are imported on first attribute access, and importing them no longer patches
+# discord.py: DiscordComponents() (or dpy_overrides.install()) does that.
+_LAZY = {
+    "DiscordComponents": "client",
+    "ComponentsClient": "client",
+    "ComponentsBot": "client",
+    "Interaction": "interaction",
+    "InteractionEventType": "interaction",
+    "Component": "component",
+    "ButtonStyle": "component",
+    "Button": "component",
+    "Select": "component",
+    "SelectOption": "component",
+    "ActionRow": "component",
+    "_get_component_type": "component",
+    "ComponentMessage": "dpy_overrides",
+    "install": "dpy_overrides",
+    "uninstall": "dpy_overrides",
+    "is_installed": "dpy_overrides",
+    "HTTPClient": "http",
+    "disable_components_bulk": "bulk",
+    "TimingWheel": "timer",
+    "View": "view",
+    "ViewStore": "view",
+    "Paginator": "paginator",
+    "ClickThrottle": "throttle",
+    "InteractionDeduplicator": "dedup",
+    "RedisDedupBackend": "dedup",
+    "WaiterIndex": "waiters",
+    "Histogram": "metrics",
+    "PipelineMetrics": "metrics",
+    "render_prometheus": "metrics",
+    "STAGES": "metrics",
+    "InteractionRecorder": "recorder",
+    "read_recording": "recorder",
+    "InteractionContext": "tracing",
+    "InteractionContextFilter": "tracing",
+    "current_interaction": "tracing",
+    "get_tracer": "tracing",
+    "set_tracer": "tracing",
+    "span": "tracing",
+    "deep_sizeof": "introspection",
+    "age_histogram": "introspection",
+    "top_prefixes": "introspection",
+    "collect_stats": "introspection",
+    "debug_dump": "introspection",
+    "CallbackWatchdog": "watchdog",
+    "ShardScheduler": "sharding",
+    "Backpressure": "backpressure",
+    "ProcessPool": "workers",
+    "ClusterRouter": "routing",
+    "InMemoryRouter": "routing",
+    "LocalSocketRouter": "routing",
+    "DispatchPlan": "dispatch",
+    "LayoutCache": "utils",
+    "PayloadFingerprints": "utils",
+    "UserCache": "users",
+    "MessageCache": "messages",
+}
+
+# what `from discord_components import *` brings in: the public classes only. helpers such as
+# span, install or collect_stats stay reachable as attributes without shadowing names in user code.
+__all__ = (
+    "DiscordComponents",
+    "ComponentsClient",
+    "ComponentsBot",
+    "Interaction",
+    "InteractionEventType",
+    "Component",
+    "ButtonStyle",
+    "Button",
+    "Select",
+    "SelectOption",
+    "ActionRow",
+    "_get_component_type",
+    "ComponentMessage",
+    "HTTPClient",
+    "View",
+    "Paginator",
+    "ClickThrottle",
+    "InteractionDeduplicator",
+    "RedisDedupBackend",
+    "PipelineMetrics",
+    "InteractionRecorder",
+    "CallbackWatchdog",
+    "ShardScheduler",
+    "Backpressure",
+    "ProcessPool",
+    "ClusterRouter",
+    "InMemoryRouter",
+    "LocalSocketRouter",
+    "UserCache",
+    "MessageCache",
+)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
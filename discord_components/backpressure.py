@@ -0,0 +1,65 @@
+__all__ = ("Backpressure",)
+
+
+class Backpressure:
+    def __init__(
+        self,
+        *,
+        high: int = 1000,
+        low: int = None,
+        busy_message: str = None,
+    ):
+        if low is None:
+            low = high * 3 // 4
+        if not 0 <= low < high:
+            raise ValueError("low must be below high.")
+
+        self.high = high
+        self.low = low
+        self.busy_message = busy_message
+        # a deferred update is the cheapest answer discord accepts; a busy message at least
+        # tells the user why nothing happened
+        if busy_message is None:
+            self.response = {"type": 6}
+        else:
+            self.response = {"type": 4, "data": {"content": busy_message, "flags": 64}}
+
+        self.in_flight = 0
+        self.shedding = False
+        self.admitted = 0
+        self.shed = 0
+        self.episodes = 0
+        self.peak = 0
+
+    def admit(self) -> bool:
+        # hysteresis: start shedding at the high watermark, keep shedding until release()
+        # sees the backlog drained to the low one
+        if not self.shedding and self.in_flight >= self.high:
+            self.shedding = True
+            self.episodes += 1
+
+        if self.shedding:
+            self.shed += 1
+            return False
+
+        self.in_flight += 1
+        self.admitted += 1
+        if self.in_flight > self.peak:
+            self.peak = self.in_flight
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        if self.shedding and self.in_flight <= self.low:
+            self.shedding = False
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "peak": self.peak,
+            "shedding": self.shedding,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "episodes": self.episodes,
+        }
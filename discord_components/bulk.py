@@ -0,0 +1,92 @@
+from typing import Iterable, List, Optional, Union
+
+from asyncio import gather, sleep, Semaphore
+from collections import defaultdict, deque
+from time import monotonic
+
+from .dpy_overrides import ComponentMessage
+from .interaction import Interaction
+
+
+__all__ = ("disable_components_bulk",)
+
+
+def _components_disabled(message: ComponentMessage) -> bool:
+    return all(
+        component.get("disabled", False)
+        for row in message._layout()
+        for component in row["components"]
+    )
+
+
+def _edit_bucket(message: ComponentMessage) -> tuple:
+    # discord limits interaction webhook edits per token, like discord.py's route locks
+    token = message._get_interaction_token()
+    if token is not None:
+        return ("webhook", token)
+
+    return ("channel", message.channel.id)
+
+
+async def _drain_bucket(
+    queue: List[tuple], rate: Optional[int], per: Optional[float], semaphore: Semaphore
+):
+    # one edit in flight per bucket. discord.py holds each route until the reset its
+    # X-RateLimit headers announce and retries 429s, so unless `rate` is given that is the pace
+    sent = deque(maxlen=rate)
+    for message, result in queue:
+        if rate is not None and len(sent) == rate:
+            delay = sent[0] + per - monotonic()
+            if delay > 0:
+                await sleep(delay)
+
+        async with semaphore:
+            if rate is not None:
+                sent.append(monotonic())
+            try:
+                edited = await message.disable_components()
+                result["status"] = "edited" if edited else "unchanged"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = e
+
+
+async def disable_components_bulk(
+    messages: Iterable[Union[ComponentMessage, Interaction]],
+    *,
+    rate: int = None,
+    per: float = 5.0,
+    concurrency: int = 50,
+) -> dict:
+    started = monotonic()
+
+    results = []
+    buckets = defaultdict(list)
+    for item in messages:
+        message = item.message if isinstance(item, Interaction) else item
+        result = {"message_id": message.id, "status": None, "error": None}
+        results.append(result)
+
+        if _components_disabled(message) or (
+            message.ephemeral and message._get_interaction_token() is None
+        ):
+            result["status"] = "skipped"
+            continue
+
+        buckets[_edit_bucket(message)].append((message, result))
+
+    semaphore = Semaphore(concurrency)
+    await gather(*(_drain_bucket(queue, rate, per, semaphore) for queue in buckets.values()))
+
+    elapsed = monotonic() - started
+    counts = {"edited": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    for result in results:
+        counts[result["status"]] += 1
+
+    return {
+        "results": results,
+        **counts,
+        "buckets": len(buckets),
+        "elapsed": elapsed,
+        "edits_per_second": counts["edited"] / elapsed if elapsed else 0.0,
+    }
@@ -1,10 +1,14 @@
-from typing import Union
+from typing import Callable, TextIO, Union
+
+from asyncio import wait_for
+from time import monotonic, time
 
 from discord import (
     Client,
     Message,
     User,
     Guild,
+    HTTPException,
 )
 from discord.ext.commands import Bot
 from discord.abc import Messageable
@@ -12,6 +16,24 @@ from discord.abc import Messageable
 from .component import Component
 from .http import HTTPClient
 from .interaction import Interaction, InteractionEventType
+from .view import View, ViewStore
+from .throttle import ClickThrottle, _click_key
+from .dedup import InteractionDeduplicator
+from .waiters import WaiterIndex
+from .metrics import PipelineMetrics
+from .recorder import InteractionRecorder
+from .introspection import collect_stats, debug_dump
+from .watchdog import CallbackWatchdog
+from .sharding import ShardScheduler
+from .backpressure import Backpressure
+from .workers import ProcessPool
+from .routing import ClusterRouter
+from .dispatch import DispatchPlan, EVENT_NAMES, EVENTS
+from .users import UserCache
+from .messages import MessageCache
+from .utils import LayoutCache, PayloadFingerprints
+from .tracing import InteractionContext, _current_interaction, span
+from .dpy_overrides import ComponentMessage, install
 
 from .ext.filters import *
 
@@ -22,20 +44,148 @@ class DiscordComponents:
     def __init__(
         self,
         bot: Union[Bot, Client],
+        *,
+        throttle: ClickThrottle = None,
+        dedup: Union[bool, InteractionDeduplicator] = True,
+        metrics: PipelineMetrics = None,
+        recorder: InteractionRecorder = None,
+        watchdog: CallbackWatchdog = None,
+        shards: ShardScheduler = None,
+        backpressure: Backpressure = None,
+        workers: ProcessPool = None,
+        router: ClusterRouter = None,
+        dispatch: str = "plan",
+        user_cache: UserCache = None,
+        message_cache: MessageCache = None,
+        skip_unchanged_edits: bool = False,
+        layout_cache: LayoutCache = None,
     ):
+        install()
         self.bot = bot
         bot.components_manager = self
+        # messages only carry the ConnectionState; this is how they find their manager
+        bot._connection.components_manager = self
 
         self.http = HTTPClient(bot=bot)
+        self.dispatch_plan = DispatchPlan(bot, mode=dispatch)
+        self.user_cache = user_cache
+        self.message_cache = message_cache
+        # only safe if nothing but this manager edits the bot's messages
+        self.fingerprints = PayloadFingerprints() if skip_unchanged_edits else None
+        self.layouts = layout_cache
         self._components_callback = {}
+        self._views = ViewStore()
+        self._waiters = WaiterIndex()
+        self.throttle = throttle
+        if dedup is True:
+            dedup = InteractionDeduplicator()
+        # a deduplicator has a __len__, so an empty one is falsy
+        self.dedup = None if dedup is False else dedup
+        self.metrics = metrics
+        self.recorder = recorder
+        if recorder is not None:
+            self._close_with_bot(recorder)
+        self.watchdog = watchdog
+        self.shards = shards
+        self.backpressure = backpressure
+        self.workers = workers
+        if workers is not None:
+            workers.bind(self)
+        if shards is not None:
+            shards.bind(self)
+        self.router = router
+        if router is not None:
+            router.bind(self)
 
         if isinstance(self.bot, Bot):
             self.bot.add_listener(self.on_socket_response, name="on_socket_response")
         else:
             self.bot.on_socket_response = self.on_socket_response
 
+    def _close_with_bot(self, recorder: InteractionRecorder):
+        # the recorder buffers, so whatever it holds when the bot closes would be lost
+        close = self.bot.close
+
+        async def close_recorder():
+            try:
+                await close()
+            finally:
+                recorder.close()
+
+        self.bot.close = close_recorder
+
     async def on_socket_response(self, res):
+        received_at = monotonic()
+        # before the filter below, so `events` can pick any gateway event
+        if self.recorder is not None:
+            self.recorder.record(res, received_at)
+
         if (res["t"] != "INTERACTION_CREATE") or (res["d"]["type"] != 3):
+            if res["t"] == "READY":
+                if self.workers is not None:
+                    self.workers.start()
+                if self.router is not None:
+                    await self.router.start()
+            return
+
+        await self._intake(res, received_at)
+
+    async def _intake(self, res: dict, received_at: float):
+        # interactions forwarded by a router enter here too. the node that received them has
+        # deduplicated them already, and with a shared backend would be the one that counts
+        if (
+            self.dedup is not None
+            and "forwarded_from" not in res
+            and await self.dedup.is_duplicate(res["d"]["id"])
+        ):
+            return
+
+        if self.workers is not None:
+            self.workers.submit(res, received_at)
+            return
+
+        if self.backpressure is not None and not self.backpressure.admit():
+            await self._shed(res["d"], self.backpressure.response)
+            return
+
+        if self.shards is not None:
+            self.shards.submit(res, received_at)
+            return
+
+        await self._handle_admitted(res, received_at)
+
+    async def _handle_admitted(self, res: dict, received_at: float):
+        # gives back the slot _intake took; anything that didn't pass through admit() must go
+        # to _handle_interaction instead
+        try:
+            await self._handle_interaction(res, received_at)
+        finally:
+            if self.backpressure is not None:
+                self.backpressure.release()
+
+    async def _handle_interaction(self, res: dict, received_at: float):
+        # everything awaited from here on, including callbacks and the events dispatched
+        # below (their tasks copy the context), can see which interaction caused it
+        context = _current_interaction.set(InteractionContext.from_payload(res["d"], received_at))
+        try:
+            with span("discord_components.interaction"):
+                await self._process_interaction(res, received_at)
+        finally:
+            _current_interaction.reset(context)
+
+    async def _process_interaction(self, res: dict, received_at: float):
+        if self.throttle is not None and self.throttle.check(_click_key(res["d"])):
+            await self._shed(res["d"])
+            return
+
+        # the router only forwards ids a peer advertised, from a table of its own: no IPC to
+        # decide, and clicks handled by views, wait_for or listeners stay here
+        if (
+            self.router is not None
+            and res["d"]["data"]["custom_id"] not in self._components_callback
+            and self._views.get(int(res["d"]["message"]["id"])) is None
+            and await self.router.route(res, received_at)
+        ):
             return
 
         if res["d"]["message"].get("message_reference") and not res["d"]["message"][
@@ -43,14 +193,23 @@ class DiscordComponents:
         ].get("channel_id"):
             res["d"]["message"]["message_reference"] = res["d"]["channel_id"]
 
-        interaction = self._get_interaction(res)
-        self.bot.dispatch(f"raw_interaction", res["d"])
-        self.bot.dispatch("interaction", interaction)
+        interaction = self._get_interaction(res, received_at)
+        if self.metrics is not None:
+            self._observe_received(interaction)
+
+        plan = self.dispatch_plan
+        plan.dispatch("raw_interaction", res["d"])
+        plan.dispatch("interaction", interaction)
+        self._waiters.resolve("interaction", interaction)
+
+        await self._views.dispatch(interaction, self._run_callback)
 
         if self._components_callback.get(interaction.custom_id):
             callback_info = self._components_callback[interaction.custom_id]
             if callback_info["uses"] == 0:
                 del self._components_callback[interaction.custom_id]
+                if self.router is not None:
+                    self.router.withdraw(interaction.custom_id)
                 return
 
             if callback_info["uses"] is not None:
@@ -58,19 +217,56 @@ class DiscordComponents:
             if not callback_info["filter"](interaction):
                 return
 
-            await self._components_callback[interaction.custom_id]["callback"](interaction)
+            await self._run_callback(
+                self._components_callback[interaction.custom_id]["callback"], interaction
+            )
+
+        names = EVENT_NAMES.get(res["d"]["data"]["component_type"])
+        if names is not None:
+            plan.dispatch(names[0], res["d"])
+            plan.dispatch(names[1], interaction)
+            self._waiters.resolve(names[1], interaction)
+
+    async def _shed(self, data: dict, response: dict = None):
+        try:
+            await self.http.initial_response(
+                interaction_id=data["id"],
+                interaction_token=data["token"],
+                data=response or {"type": 6},
+            )
+        except HTTPException:
+            pass
+
+    def _observe_received(self, interaction: Interaction):
+        metrics = self.metrics
+        route = interaction._route = metrics.route_of(interaction)
+        created_at = ((interaction.interaction_id >> 22) + 1420070400000) / 1000
+        metrics.observe(route, "gateway", time() - created_at)
+        metrics.observe(route, "parse", interaction._parsed_at - interaction._received_at)
 
-        for _type in InteractionEventType:
-            if _type.value == res["d"]["data"]["component_type"]:
-                self.bot.dispatch(f"raw_{_type.name}", res["d"])
-                self.bot.dispatch(_type.name, interaction)
-                break
+    async def _run_callback(self, callback, interaction: Interaction):
+        metrics = self.metrics
+        if metrics is None or interaction._route is None:
+            return await self._invoke(callback, interaction)
 
-    def _get_interaction(self, json: dict):
+        started = monotonic()
+        metrics.observe(interaction._route, "dispatch", started - interaction._parsed_at)
+        try:
+            return await self._invoke(callback, interaction)
+        finally:
+            metrics.observe(interaction._route, "callback", monotonic() - started)
+
+    def _invoke(self, callback, interaction: Interaction):
+        if self.watchdog is None:
+            return callback(interaction)
+        return self.watchdog.run(callback, interaction)
+
+    def _get_interaction(self, json: dict, received_at: float = None):
         ctx = Interaction(
             state=self.bot._connection,
             client=self,
             raw_data=json["d"],
+            received_at=received_at,
         )
         return ctx
 
@@ -84,6 +280,7 @@ class DiscordComponents:
         guild: Guild = None,
         channel: Messageable = None,
         user: User = None,
+        check: Union[Filter, Callable[[Interaction], bool]] = None,
         timeout: float = None,
     ):
         check_list = []
@@ -97,23 +294,69 @@ class DiscordComponents:
             check_list.append(channel_filter(channel))
         if user is not None:
             check_list.append(user_filter(user))
+        if check is not None:
+            check_list.append(check)
+        check = Filter.all(*check_list)
+
+        if event in EVENTS:
+            self._check_not_offloaded(f"wait_for({event!r})")
+        if event != "interaction" and event not in InteractionEventType.__members__:
+            # the raw_* events are never dispatched in registry mode, so this would never return
+            if self.dispatch_plan.mode == "registry" and event in EVENTS:
+                raise ValueError(
+                    f"{event} is not dispatched with dispatch='registry', "
+                    f"wait for {event[len('raw_'):]} instead."
+                )
+            return await self.bot.wait_for(event, check=check.compile(), timeout=timeout)
 
-        def check(interaction: Interaction):
-            for i in check_list:
-                if not i(interaction):
-                    return False
-            return True
+        waiter = self._waiters.add(event, check)
+        try:
+            return await wait_for(waiter.future, timeout)
+        finally:
+            self._waiters.remove(waiter)
 
-        return await self.bot.wait_for(event, check=check, timeout=timeout)
+    def _check_not_offloaded(self, what: str):
+        # with workers=, _intake hands every click to a worker process before any of this is
+        # looked at; the workers' own managers, made in ProcessPool's setup, are the ones to use
+        if self.workers is not None:
+            raise ValueError(
+                f"{what} never sees a click with workers=, "
+                "register it in the ProcessPool setup instead."
+            )
 
     def add_callback(self, component: Component, callback, *, uses: int = None, filter=None):
+        self._check_not_offloaded("add_callback()")
         self._components_callback[component.custom_id] = {
             "callback": callback,
             "uses": uses,
             "filter": filter or (lambda x: True),
+            "created_at": monotonic(),
         }
+        if self.router is not None:
+            self.router.advertise(component.custom_id)
         return component
 
+    def add_view(self, view: View, message: ComponentMessage) -> View:
+        self._check_not_offloaded("add_view()")
+        return self._views.add(view, message)
+
+    def remove_view(self, view: View):
+        self._views.remove(view)
+
+    def get_view(self, message_id: int):
+        return self._views.get(message_id)
+
+    @property
+    def active_views(self) -> int:
+        return len(self._views)
+
+    @property
+    def stats(self) -> dict:
+        return collect_stats(self)
+
+    def debug_dump(self, file: Union[str, TextIO] = None, *, limit: int = 1000) -> dict:
+        return debug_dump(self, file, limit=limit)
+
 
 class ComponentsClient(Client):
     def __init__(self, *args, **kwargs):
@@ -1,3 +1,6 @@
 """Discord Components Constants"""
 
 __version__ = "2.1.2"
+
+INTERACTION_TOKEN_LIFETIME = 15 * 60
+INTERACTION_RESPONSE_TIMEOUT = 3.0
@@ -0,0 +1,65 @@
+import logging
+from time import monotonic
+
+
+__all__ = ("InteractionDeduplicator", "RedisDedupBackend")
+
+
+log = logging.getLogger("discord_components.dedup")
+
+
+class RedisDedupBackend:
+    def __init__(self, redis, *, prefix: str = "discord_components:interaction:"):
+        self.redis = redis
+        self.prefix = prefix
+
+    async def add(self, interaction_id: str, ttl: float) -> bool:
+        return bool(
+            await self.redis.set(
+                self.prefix + interaction_id, 1, nx=True, px=max(int(ttl * 1000), 1)
+            )
+        )
+
+
+class InteractionDeduplicator:
+    def __init__(self, *, size: int = 4096, window: float = 60.0, backend=None):
+        self.size = size
+        self.window = window
+        self.backend = backend
+
+        self._ring = [None] * size
+        self._index = 0
+        self._seen = {}
+        self.duplicates = 0
+        self.backend_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _check_local(self, interaction_id: str, now: float) -> bool:
+        seen_at = self._seen.get(interaction_id)
+        if seen_at is not None and now - seen_at < self.window:
+            return True
+
+        evicted = self._ring[self._index]
+        if evicted is not None and self._seen.get(evicted[0]) == evicted[1]:
+            del self._seen[evicted[0]]
+
+        self._ring[self._index] = (interaction_id, now)
+        self._index = (self._index + 1) % self.size
+        self._seen[interaction_id] = now
+        return False
+
+    async def is_duplicate(self, interaction_id: str) -> bool:
+        duplicate = self._check_local(interaction_id, monotonic())
+        if not duplicate and self.backend is not None:
+            try:
+                duplicate = not await self.backend.add(interaction_id, self.window)
+            except Exception:
+                # better to handle a redelivery twice than to drop every interaction
+                self.backend_errors += 1
+                log.exception("dedup backend failed, treating %s as new", interaction_id)
+
+        if duplicate:
+            self.duplicates += 1
+        return duplicate
@@ -0,0 +1,76 @@
+from typing import FrozenSet
+
+from .interaction import InteractionEventType
+
+
+__all__ = ("DispatchPlan", "DISPATCH_MODES")
+
+DISPATCH_MODES = ("all", "plan", "registry")
+
+# component_type -> the two events dispatched for it
+EVENT_NAMES = {_type.value: (f"raw_{_type.name}", _type.name) for _type in InteractionEventType}
+EVENTS = (
+    "raw_interaction",
+    "interaction",
+    *(name for names in EVENT_NAMES.values() for name in names),
+)
+
+
+class DispatchPlan:
+    # "all" dispatches every event like before, "plan" only the ones something listens to and
+    # "registry" none at all: views, add_callback and DiscordComponents.wait_for still work.
+    def __init__(self, bot, *, mode: str = "plan"):
+        if mode not in DISPATCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(DISPATCH_MODES)}.")
+
+        self.bot = bot
+        self.mode = mode
+        self._generation = None
+        self._subscribed: FrozenSet[str] = frozenset()
+        self.dispatched = 0
+        self.skipped = 0
+
+    def invalidate(self):
+        # needed only after assigning bot.on_<event> directly; add_listener, remove_listener,
+        # @bot.event and cogs are picked up on their own
+        self._generation = None
+
+    def _compile(self):
+        bot = self.bot
+        extra_events = getattr(bot, "extra_events", {})
+        self._subscribed = frozenset(
+            event
+            for event in EVENTS
+            if hasattr(bot, f"on_{event}") or extra_events.get(f"on_{event}")
+        )
+        self._generation = getattr(bot, "_listener_generation", 0)
+
+    @property
+    def subscribed(self) -> FrozenSet[str]:
+        if self._generation != getattr(self.bot, "_listener_generation", 0):
+            self._compile()
+        return self._subscribed
+
+    def wants(self, event: str) -> bool:
+        if self.mode == "all":
+            return True
+        if self.mode == "registry":
+            return False
+        # bot.wait_for() futures come and go with every call, so they're looked up live
+        return event in self.subscribed or bool(self.bot._listeners.get(event))
+
+    def dispatch(self, event: str, *args):
+        if self.wants(event):
+            self.dispatched += 1
+            self.bot.dispatch(event, *args)
+        else:
+            self.skipped += 1
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "subscribed": sorted(self.subscribed),
+            "dispatched": self.dispatched,
+            "skipped": self.skipped,
+        }
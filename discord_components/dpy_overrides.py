@@ -1,36 +1,120 @@
 from typing import Optional, List, Union
 
 from discord import (
+    Client,
     Message,
     Embed,
     Attachment,
     AllowedMentions,
     File,
     MessageFlags,
+    NotFound,
+    InvalidArgument,
 )
 from discord.http import Route, HTTPClient
 from discord.abc import Messageable, Snowflake
 from discord.ext.commands import Context
+from discord.ext.commands.bot import BotBase
+from discord.utils import parse_time
 
-from .utils import _get_components_json, _form_files
+from time import monotonic
+
+from .utils import (
+    _get_components_json,
+    _form_files,
+    disabled_layout,
+    patched_layout,
+)
 from .component import _get_component_type, ActionRow, Component
+from .const import INTERACTION_TOKEN_LIFETIME
+from .tracing import span
+from .http import ORIGINAL_MESSAGE_ROUTE, EDIT_MESSAGE_ROUTE, SEND_MESSAGE_ROUTE
+
+__all__ = ("ComponentMessage", "install", "uninstall", "is_installed")
+
+
+_SLOTS = {}
 
-__all__ = ("ComponentMessage",)
+
+def _from_manager(state, name: str):
+    # DiscordComponents registers itself on the ConnectionState every message holds, so what
+    # it was configured with (fingerprints, caches) is looked up there; None without one
+    return getattr(getattr(state, "components_manager", None), name, None)
+
+
+def _remember_layout(state, message_id: int, layout: Optional[List[dict]], res):
+    layouts = _from_manager(state, "layouts")
+    if layouts is None:
+        return
+
+    # without the message Discord answered with there's no edited_timestamp to match later,
+    # and an edit that left the components alone still moved it on
+    if layout is None or not isinstance(res, dict) or "edited_timestamp" not in res:
+        layouts.discard(message_id)
+    else:
+        layouts.put(message_id, layout, parse_time(res["edited_timestamp"]))
+
+
+def _copy(obj):
+    # copy.copy goes through __reduce_ex__, which is several times slower on these slotted
+    # classes than setting the slots directly. _cs_* slots are cached properties: the copy
+    # recomputes them instead.
+    cls = type(obj)
+    slots = _SLOTS.get(cls)
+    if slots is None:
+        slots = _SLOTS[cls] = tuple(
+            {
+                name: None
+                for klass in cls.__mro__
+                for name in getattr(klass, "__slots__", ())
+                if not name.startswith(("__", "_cs_"))
+            }
+        )
+
+    clone = object.__new__(cls)
+    setattr_ = object.__setattr__
+    for name in slots:
+        try:
+            setattr_(clone, name, getattr(obj, name))
+        except AttributeError:
+            pass
+    return clone
+
+
+def _parse_components(rows: List[dict]) -> List[ActionRow]:
+    components = []
+    for i in rows:
+        components.append(ActionRow())
+        for j in i["components"]:
+            components[-1].append(_get_component_type(j["type"]).from_json(j))
+    return components
 
 
 class ComponentMessage(Message):
-    __slots__ = tuple(list(Message.__slots__) + ["components", "ephemeral"])
+    __slots__ = tuple(
+        list(Message.__slots__)
+        + ["components", "ephemeral", "_interaction_token", "_interaction_expires_at"]
+    )
 
     def __init__(self, *, state, channel, data, ephemeral=False):
         super().__init__(state=state, channel=channel, data=data)
         self.ephemeral = ephemeral
+        self._interaction_token = None
+        self._interaction_expires_at = 0.0
 
-        components = []
-        for i in data["components"]:
-            components.append(ActionRow())
-            for j in i["components"]:
-                components[-1].append(_get_component_type(j["type"]).from_json(j))
-        self.components: List[ActionRow] = components
+        self.components: List[ActionRow] = _parse_components(data["components"])
+
+    def _copy(self) -> "ComponentMessage":
+        # what one interaction gets: binding its token or disabling its components must not
+        # reach the object the sender, or any other click on the message, is holding
+        message = _copy(self)
+        message.components = [ActionRow(*map(_copy, row.components)) for row in self.components]
+        message._unbind_interaction()
+        return message
+
+    def _refresh(self, data: dict):
+        self._update(data)
+        self.components = _parse_components(data["components"])
 
     def get_component(self, custom_id: str) -> Optional[Component]:
         for row in self.components:
@@ -38,11 +122,112 @@ class ComponentMessage(Message):
                 if component.custom_id == custom_id:
                     return component
 
-    async def disable_components(self) -> None:
-        await self.edit(
-            components=[row.disable_components() for row in self.components],
+    def _bind_interaction(self, token: str, expires_at: float = None):
+        self._interaction_token = token
+        self._interaction_expires_at = (
+            expires_at if expires_at is not None else monotonic() + INTERACTION_TOKEN_LIFETIME
         )
 
+    def _unbind_interaction(self):
+        self._interaction_token = None
+        self._interaction_expires_at = 0.0
+
+    def _get_interaction_token(self) -> Optional[str]:
+        if self._interaction_token is None:
+            return None
+
+        if monotonic() >= self._interaction_expires_at:
+            self._unbind_interaction()
+            return None
+
+        return self._interaction_token
+
+    async def _edit_payload(self, data: dict):
+        token = self._get_interaction_token()
+        if token is not None:
+            try:
+                with span(
+                    "PATCH " + ORIGINAL_MESSAGE_ROUTE,
+                    {
+                        "http.method": "PATCH",
+                        "http.route": ORIGINAL_MESSAGE_ROUTE,
+                        "discord.message.id": self.id,
+                    },
+                ):
+                    return await self._state.http.request(
+                        Route(
+                            "PATCH",
+                            f"/webhooks/{self._state.self_id}/{token}/messages/@original",
+                        ),
+                        json=data,
+                    )
+            except NotFound:
+                self._unbind_interaction()
+                # an ephemeral message can't be edited any other way: the edit didn't happen
+                if self.ephemeral:
+                    raise
+
+        if self.ephemeral:
+            return
+
+        with span(
+            "PATCH " + EDIT_MESSAGE_ROUTE,
+            {
+                "http.method": "PATCH",
+                "http.route": EDIT_MESSAGE_ROUTE,
+                "discord.message.id": self.id,
+            },
+        ):
+            return await self._state.http.request(
+                Route(
+                    "PATCH",
+                    "/channels/{channel_id}/messages/{message_id}",
+                    channel_id=self.channel.id,
+                    message_id=self.id,
+                ),
+                json=data,
+            )
+
+    def _layout(self) -> List[dict]:
+        layouts = _from_manager(self._state, "layouts")
+        if layouts is not None:
+            layout = layouts.get(self.id, self._edited_timestamp)
+            if layout is not None:
+                return layout
+        return [row.to_dict() for row in self.components]
+
+    async def _edit_if_changed(self, data: dict) -> bool:
+        fingerprints = _from_manager(self._state, "fingerprints")
+        if fingerprints is not None and fingerprints.matches(self.id, data):
+            return False
+
+        res = await self._edit_payload(data)
+        if fingerprints is not None:
+            fingerprints.update(self.id, data)
+        _remember_layout(self._state, self.id, data.get("components"), res)
+        return True
+
+    async def _edit_components(self, layout: List[dict]) -> bool:
+        if self.ephemeral and self._get_interaction_token() is None:
+            return False
+
+        return await self._edit_if_changed({"components": layout})
+
+    async def disable_components(self) -> bool:
+        # False when no edit was sent because the message already looked like this
+        layout = disabled_layout(self._layout())
+        for row in self.components:
+            row.disable_components()
+        return await self._edit_components(layout)
+
+    async def update_component(self, custom_id: str, **fields) -> None:
+        layout = patched_layout(self._layout(), custom_id, **fields)
+        if layout is None:
+            raise InvalidArgument(f"message has no component with custom_id {custom_id!r}")
+        await self._edit_components(layout)
+        # without a layout cache the next _layout() starts from these
+        self.components = _parse_components(layout)
+
     async def edit(
         self,
         content: Optional[str] = None,
@@ -55,7 +240,7 @@ class ComponentMessage(Message):
         components: List[Union[ActionRow, Component, List[Component]]] = None,
         **fields,
     ):
-        if self.ephemeral:
+        if self.ephemeral and self._get_interaction_token() is None:
             return
 
         state = self._state
@@ -94,15 +279,7 @@ class ComponentMessage(Message):
             data["components"] = _get_components_json(components)
 
         if data:
-            await state.http.request(
-                Route(
-                    "PATCH",
-                    "/channels/{channel_id}/messages/{message_id}",
-                    channel_id=self.channel.id,
-                    message_id=self.id,
-                ),
-                json=data,
-            )
+            await self._edit_if_changed(data)
 
         if delete_after is not None:
             await self.delete(delay=delete_after)
@@ -111,6 +288,15 @@ class ComponentMessage(Message):
         if self.ephemeral:
             return
 
+        layouts = _from_manager(self._state, "layouts")
+        if layouts is not None:
+            layouts.discard(self.id)
+        fingerprints = _from_manager(self._state, "fingerprints")
+        if fingerprints is not None:
+            fingerprints.discard(self.id)
+        message_cache = _from_manager(self._state, "message_cache")
+        if message_cache is not None:
+            message_cache.discard(self.id)
         return await super().delete(*args, **kwargs)
 
 
@@ -121,9 +307,6 @@ def new_override(cls, *args, **kwargs):
         return object.__new__(cls)
 
 
-Message.__new__ = new_override
-
-
 def send_files(
     self,
     channel_id: Snowflake,
@@ -211,10 +394,6 @@ def send_message(
     )
 
 
-HTTPClient.send_files = send_files
-HTTPClient.send_message = send_message
-
-
 async def send(
     self,
     content=None,
@@ -335,6 +514,24 @@ async def send(
         )
 
     ret = ComponentMessage(state=state, channel=channel, data=data)
+    message_cache = _from_manager(state, "message_cache")
+    if message_cache is not None:
+        message_cache.put(ret, data)
+    _remember_layout(state, ret.id, components, data)
+    fingerprints = _from_manager(state, "fingerprints")
+    if fingerprints is not None:
+        fingerprints.update(
+            ret.id,
+            {
+                key: value
+                for key, value in (
+                    ("content", content),
+                    ("embeds", embeds),
+                    ("components", components),
+                )
+                if value is not None
+            },
+        )
     if delete_after is not None:
         await ret.delete(delay=delete_after)
     return ret
@@ -346,7 +543,10 @@ async def send_override(context_or_channel, *args, **kwargs):
     else:
         channel = context_or_channel
 
-    return await send(channel, *args, **kwargs)
+    with span(
+        "POST " + SEND_MESSAGE_ROUTE, {"http.method": "POST", "http.route": SEND_MESSAGE_ROUTE}
+    ):
+        return await send(channel, *args, **kwargs)
 
 
 async def fetch_message(context_or_channel, id: int):
@@ -360,5 +560,58 @@ async def fetch_message(context_or_channel, id: int):
     return ComponentMessage(state=state, channel=channel, data=data)
 
 
-Messageable.send = send_override
-Messageable.fetch_message = fetch_message
+# listener changes bump a counter that DispatchPlan compares against before trusting its cache
+def _bump_listeners(bot):
+    bot._listener_generation = getattr(bot, "_listener_generation", 0) + 1
+
+
+def add_listener(self, func, name=None):
+    _originals[(BotBase, "add_listener")](self, func, name)
+    _bump_listeners(self)
+
+
+def remove_listener(self, func, name=None):
+    _originals[(BotBase, "remove_listener")](self, func, name)
+    _bump_listeners(self)
+
+
+def event(self, coro):
+    coro = _originals[(Client, "event")](self, coro)
+    _bump_listeners(self)
+    return coro
+
+
+_PATCHES = (
+    (Message, "__new__", new_override),
+    (HTTPClient, "send_files", send_files),
+    (HTTPClient, "send_message", send_message),
+    (Messageable, "send", send_override),
+    (Messageable, "fetch_message", fetch_message),
+    (BotBase, "add_listener", add_listener),
+    (BotBase, "remove_listener", remove_listener),
+    (Client, "event", event),
+)
+_MISSING = object()
+_originals = {}
+
+
+def install():
+    if _originals:
+        return
+
+    for owner, name, patch in _PATCHES:
+        _originals[(owner, name)] = owner.__dict__.get(name, _MISSING)
+        setattr(owner, name, patch)
+
+
+def uninstall():
+    for (owner, name), original in _originals.items():
+        if original is _MISSING:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+    _originals.clear()
+
+
+def is_installed() -> bool:
+    return bool(_originals)
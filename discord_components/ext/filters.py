@@ -1,3 +1,7 @@
+from typing import Callable, Dict, Union
+
+from operator import attrgetter
+
 from discord import Message, Guild, TextChannel, User
 
 from discord_components.interaction import Interaction
@@ -5,6 +9,7 @@ from discord_components.component import Component, Button, SelectOption
 
 
 __all__ = (
+    "Filter",
     "message_filter",
     "component_filter",
     "guild_filter",
@@ -13,39 +18,207 @@ __all__ = (
 )
 
 
-def message_filter(message: Message, ephemeral: bool = False):
-    def _filter(interaction: Interaction):
-        if ephemeral or isinstance(interaction.message, dict):
+class Filter:
+    _compiled = None
+
+    def __call__(self, interaction: Interaction) -> bool:
+        return self.compile()(interaction)
+
+    def __and__(self, other: Union["Filter", Callable]) -> "Filter":
+        return AndFilter(self, _as_filter(other))
+
+    def __rand__(self, other: Union["Filter", Callable]) -> "Filter":
+        return AndFilter(_as_filter(other), self)
+
+    def __or__(self, other: Union["Filter", Callable]) -> "Filter":
+        return OrFilter(self, _as_filter(other))
+
+    def __ror__(self, other: Union["Filter", Callable]) -> "Filter":
+        return OrFilter(_as_filter(other), self)
+
+    def __invert__(self) -> "Filter":
+        return NotFilter(self)
+
+    @property
+    def keys(self) -> Dict[str, object]:
+        # attribute -> value equalities every matching interaction satisfies
+        return {}
+
+    @property
+    def exact(self) -> bool:
+        # whether matching ``keys`` alone is enough, i.e. the predicate can be skipped
+        return False
+
+    def compile(self) -> Callable[[Interaction], bool]:
+        if self._compiled is None:
+            self._compiled = self._compile()
+        return self._compiled
+
+    def _compile(self) -> Callable[[Interaction], bool]:
+        raise NotImplementedError
+
+    @classmethod
+    def all(cls, *filters: Union["Filter", Callable]) -> "Filter":
+        if not filters:
+            return ConstFilter(True)
+        if len(filters) == 1:
+            return _as_filter(filters[0])
+        return AndFilter(*map(_as_filter, filters))
+
+
+class ConstFilter(Filter):
+    def __init__(self, value: bool):
+        self.value = value
+
+    @property
+    def exact(self) -> bool:
+        return self.value
+
+    def _compile(self):
+        value = self.value
+        return lambda interaction: value
+
+
+class PredicateFilter(Filter):
+    def __init__(self, predicate: Callable[[Interaction], bool]):
+        self.predicate = predicate
+
+    def _compile(self):
+        return self.predicate
+
+
+class EqualFilter(Filter):
+    def __init__(self, attr: str, value):
+        self.attr = attr
+        self.value = value
+
+    @property
+    def keys(self) -> Dict[str, object]:
+        return {self.attr: self.value}
+
+    @property
+    def exact(self) -> bool:
+        return True
+
+    def _compile(self):
+        getter = attrgetter(self.attr)
+        value = self.value
+        return lambda interaction: getter(interaction) == value
+
+
+class AndFilter(Filter):
+    def __init__(self, *filters: Filter):
+        self.filters = []
+        for f in filters:
+            self.filters.extend(f.filters if isinstance(f, AndFilter) else [f])
+
+    def _split(self):
+        keys = {}
+        rest = []
+        for f in self.filters:
+            if isinstance(f, EqualFilter):
+                if f.attr in keys and keys[f.attr] != f.value:
+                    return None, None
+                keys[f.attr] = f.value
+            elif isinstance(f, ConstFilter):
+                if not f.value:
+                    return None, None
+            else:
+                rest.append(f)
+        return keys, rest
+
+    @property
+    def keys(self) -> Dict[str, object]:
+        keys, rest = self._split()
+        if keys is None:
+            return {}
+
+        for f in rest:
+            keys.update(f.keys)
+        return keys
+
+    @property
+    def exact(self) -> bool:
+        keys, rest = self._split()
+        return keys is not None and all(
+            f.exact and set(f.keys).issubset(keys) for f in rest
+        )
+
+    def _compile(self):
+        keys, rest = self._split()
+        if keys is None:
+            return lambda interaction: False
+
+        # equality checks fold into a single attrgetter call and tuple comparison
+        checks = [f.compile() for f in rest]
+        if keys:
+            getter = attrgetter(*keys)
+            expected = tuple(keys.values()) if len(keys) > 1 else next(iter(keys.values()))
+            checks.insert(0, lambda interaction: getter(interaction) == expected)
+
+        if not checks:
+            return lambda interaction: True
+        if len(checks) == 1:
+            return checks[0]
+
+        def _filter(interaction: Interaction):
+            for check in checks:
+                if not check(interaction):
+                    return False
+            return True
+
+        return _filter
+
+
+class OrFilter(Filter):
+    def __init__(self, *filters: Filter):
+        self.filters = []
+        for f in filters:
+            self.filters.extend(f.filters if isinstance(f, OrFilter) else [f])
+
+    def _compile(self):
+        checks = [f.compile() for f in self.filters]
+
+        def _filter(interaction: Interaction):
+            for check in checks:
+                if check(interaction):
+                    return True
             return False
 
-        return interaction.message.id == message.id
+        return _filter
+
+
+class NotFilter(Filter):
+    def __init__(self, filter: Filter):
+        self.filter = filter
+
+    def _compile(self):
+        check = self.filter.compile()
+        return lambda interaction: not check(interaction)
 
-    return _filter
 
+def _as_filter(value: Union[Filter, Callable]) -> Filter:
+    return value if isinstance(value, Filter) else PredicateFilter(value)
 
-def component_filter(component: Component):
-    def _filter(interaction: Interaction):
-        return interaction.custom_id == component.id
 
-    return _filter
+def message_filter(message: Message, ephemeral: bool = False) -> Filter:
+    if ephemeral:
+        return ConstFilter(False)
 
+    return EqualFilter("message.id", message.id)
 
-def guild_filter(guild: Guild):
-    def _filter(interaction: Interaction):
-        return interaction.guild_id == guild.id
 
-    return _filter
+def component_filter(component: Component) -> Filter:
+    return EqualFilter("custom_id", component.id)
 
 
-def channel_filter(channel: TextChannel):
-    def _filter(interaction: Interaction):
-        return interaction.channel_id == channel.id
+def guild_filter(guild: Guild) -> Filter:
+    return EqualFilter("guild_id", guild.id)
 
-    return _filter
 
+def channel_filter(channel: TextChannel) -> Filter:
+    return EqualFilter("channel_id", channel.id)
 
-def user_filter(user: User):
-    def _filter(interaction: Interaction):
-        return interaction.user.id == user.id
 
-    return _filter
+def user_filter(user: User) -> Filter:
+    return EqualFilter("user.id", user.id)
@@ -1,17 +1,59 @@
 from typing import List
 
-from discord import Client, File
+from asyncio import sleep, wait_for, TimeoutError
+from random import uniform
+from time import monotonic
+
+from aiohttp import ClientConnectorError, ClientError
+from discord import Client, File, HTTPException
 from discord.http import Route
 
 from .utils import _form_files
+from .tracing import span
 
 
 __all__ = ("HTTPClient",)
 
 
+ALREADY_ACKNOWLEDGED = 40060
+
+# route templates without ids or tokens, safe to put on spans
+CALLBACK_ROUTE = "/interactions/{interaction_id}/{interaction_token}/callback"
+ORIGINAL_MESSAGE_ROUTE = "/webhooks/{application_id}/{interaction_token}/messages/@original"
+EDIT_MESSAGE_ROUTE = "/channels/{channel_id}/messages/{message_id}"
+SEND_MESSAGE_ROUTE = "/channels/{channel_id}/messages"
+
+
 class HTTPClient:
-    def __init__(self, bot: Client):
+    def __init__(
+        self,
+        bot: Client,
+        *,
+        max_retries: int = 3,
+        retry_delay: float = 0.05,
+        min_attempt_time: float = 0.25,
+    ):
         self.bot = bot
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.min_attempt_time = min_attempt_time
+
+    async def _request(self, route: Route, template: str, data: dict, files: List[File] = None):
+        with span(
+            f"{route.method} {template}", {"http.method": route.method, "http.route": template}
+        ):
+            if files is not None:
+                for file in files:
+                    file.reset()
+
+                return await self.bot.http.request(
+                    route, data=_form_files(data, files), files=files
+                )
+            else:
+                return await self.bot.http.request(
+                    route,
+                    json=data,
+                )
 
     def edit_response(
         self, interaction_token: str, data: dict, files: List[File] = None
@@ -21,34 +63,62 @@ class HTTPClient:
             f"/webhooks/{self.bot.user.id}/{interaction_token}/messages/@original",
         )
 
-        if files is not None:
-            return self.bot.http.request(
-                route, data=_form_files(data, files), files=files
-            )
-        else:
-            return self.bot.http.request(
-                route,
-                json=data,
-            )
-
-    def initial_response(
+        return self._request(route, ORIGINAL_MESSAGE_ROUTE, data, files)
+
+    async def initial_response(
         self,
         interaction_id: int,
         interaction_token: str,
         data: dict,
         files: List[File] = None,
+        *,
+        deadline: float = None,
     ):
         route = Route(
             "POST",
             f"/interactions/{interaction_id}/{interaction_token}/callback",
         )
 
-        if files is not None:
-            return self.bot.http.request(
-                route, data=_form_files(data, files), files=files
-            )
-        else:
-            return self.bot.http.request(
-                route,
-                json=data,
-            )
+        attempt = 0
+        # set once an attempt may have reached discord without us seeing the answer: a timeout
+        # or a connection dropped after the request went out. an error response or a failed
+        # connect means discord never took the interaction.
+        ambiguous = False
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - monotonic(), self.min_attempt_time)
+
+            try:
+                return await wait_for(self._request(route, CALLBACK_ROUTE, data, files), timeout)
+            except HTTPException as e:
+                if attempt and e.code == ALREADY_ACKNOWLEDGED:
+                    return None
+                if e.status < 500:
+                    raise
+                error = e
+            except ClientConnectorError as e:
+                error = e
+            except (ClientError, OSError, TimeoutError) as e:
+                ambiguous = True
+                error = e
+
+            # the failed attempt may still have reached discord, so a retry has to either
+            # see "already acknowledged" or land before the interaction's deadline.
+            attempt += 1
+            delay = uniform(0, self.retry_delay * 2 ** attempt)
+            if attempt > self.max_retries or (
+                deadline is not None
+                and deadline - monotonic() - delay < self.min_attempt_time
+            ):
+                # if an earlier attempt did land, @original already exists and can carry the
+                # message; otherwise editing it can only 404 and hide the real error
+                if ambiguous and data.get("type") in (4, 7):
+                    message = {k: v for k, v in data["data"].items() if k != "tts"}
+                    try:
+                        return await self.edit_response(interaction_token, message, files)
+                    except (HTTPException, ClientError, OSError):
+                        pass
+                raise error
+
+            await sleep(delay)
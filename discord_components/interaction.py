@@ -15,10 +15,18 @@ from discord.state import ConnectionState
 from discord.abc import Messageable
 
 from enum import IntEnum
+from time import monotonic
 
-from .utils import _get_components_json
+from .utils import (
+    _get_components_json,
+    fingerprint_fields,
+    disabled_layout,
+    patched_layout,
+)
 from .component import Component, ActionRow, Button, Select
-from .dpy_overrides import ComponentMessage
+from .dpy_overrides import ComponentMessage, _parse_components, _remember_layout
+from .users import _user_from_payload
+from .const import INTERACTION_TOKEN_LIFETIME, INTERACTION_RESPONSE_TIMEOUT
 
 
 __all__ = ("Interaction", "InteractionEventType")
@@ -29,6 +37,13 @@ class InteractionEventType(IntEnum):
     select_option = 3
 
 
+def _displayed(data: dict) -> dict:
+    # of the flags, only suppress_embeds changes how an existing message looks
+    if "flags" in data:
+        data = {**data, "flags": data["flags"] & MessageFlags.suppress_embeds.flag}
+    return data
+
+
 class Interaction:
     def __init__(
         self,
@@ -36,12 +51,15 @@ class Interaction:
         state: ConnectionState,
         client: "DiscordComponents",
         raw_data: dict,
+        received_at: float = None,
     ):
         self.state: ConnectionState = state
         self.client: "DiscordComponents" = client
 
         self.interaction_id: int = int(raw_data["id"])
         self.interaction_token: str = raw_data["token"]
+        self._received_at: float = received_at if received_at is not None else monotonic()
+        self._route: Optional[str] = None
 
         self.custom_id: str = raw_data["data"]["custom_id"]
         self.values: List[str] = raw_data["data"].get("values", [])
@@ -52,22 +70,23 @@ class Interaction:
         if self.guild_id is not None:
             self.guild_id = int(self.guild_id)
 
-        if self.guild:
-            self.user: Union[User, Member] = Member(
-                state=state, guild=self.guild, data=raw_data["member"]
-            )
-        elif raw_data.get("member"):
-            self.user: Union[User, Member] = User(state=state, data=raw_data["member"]["user"])
+        user_cache = getattr(client, "user_cache", None)
+        if user_cache is not None:
+            self.user: Union[User, Member] = user_cache.resolve(state, self.guild, raw_data)
         else:
-            self.user: Union[User, Member] = User(state=state, data=raw_data["user"])
+            self.user: Union[User, Member] = _user_from_payload(state, self.guild, raw_data)
         self.author: Union[User, Member] = self.user
 
-        self.message: Union[ComponentMessage, dict] = ComponentMessage(
-            state=state,
-            channel=self.channel,
-            data=raw_data["message"],
-            ephemeral=raw_data["message"].get("flags") == 64,
-        )
+        message_cache = getattr(client, "message_cache", None)
+        message = message_cache.get(raw_data["message"]) if message_cache is not None else None
+        if message is None:
+            message = ComponentMessage(
+                state=state,
+                channel=self.channel,
+                data=raw_data["message"],
+                ephemeral=raw_data["message"].get("flags") == 64,
+            )
+        self.message: Union[ComponentMessage, dict] = message
         self.component: Component = self.message.get_component(custom_id=self.custom_id)
 
         self.raw_data: dict = raw_data
@@ -76,6 +95,8 @@ class Interaction:
 
         self._deferred_hidden = False
         self._deferred_edit_origin = False
+        self._origin_fields: Optional[dict] = None
+        self._parsed_at: float = monotonic()
 
     @property
     def channel(self) -> Optional[Messageable]:
@@ -85,6 +106,14 @@ class Interaction:
     def guild(self) -> Optional[Guild]:
         return self.state._get_guild(self.guild_id)
 
+    @property
+    def token_expires_at(self) -> float:
+        return self._received_at + INTERACTION_TOKEN_LIFETIME
+
+    @property
+    def response_deadline(self) -> float:
+        return self._received_at + INTERACTION_RESPONSE_TIMEOUT
+
     async def defer(self, ephemeral: bool = True, edit_origin: bool = False):
         if self.deferred or self.responded:
             return
@@ -151,9 +180,6 @@ class Interaction:
         if components is not None:
             data["components"] = _get_components_json(components)
 
-        if not self.deferred:
-            data = {"type": type, "data": data}
-
         if file is not None and files is not None:
             raise ValueError("cannot pass both file and files parameter to send()")
         elif files is not None:
@@ -162,6 +188,54 @@ class Interaction:
         if file is not None:
             files = [file]
 
+        return await self._send_response(type, data, files)
+
+    def _origin_matches(self, data: dict) -> bool:
+        # only with DiscordComponents(skip_unchanged_edits=True). compared with the message as
+        # this interaction's payload shows it, plus whatever this interaction changed since
+        fingerprints = getattr(self.client, "fingerprints", None)
+        if fingerprints is None:
+            return False
+
+        if self._origin_fields is None:
+            message = self.raw_data["message"]
+            self._origin_fields = fingerprint_fields(
+                _displayed(
+                    {
+                        "content": message.get("content", ""),
+                        "embeds": [Embed.from_dict(e).to_dict() for e in message.get("embeds", [])],
+                        "components": [
+                            row.to_dict()
+                            for row in _parse_components(message.get("components", []))
+                        ],
+                        "flags": message.get("flags", 0),
+                    }
+                )
+            )
+        return fingerprints.compare(self._origin_fields, _displayed(data))
+
+    async def _send_response(self, type: int, data: dict, files: List[File] = None):
+        components = data.get("components")
+        # type 7, or any edit after an edit_origin defer, changes the clicked message
+        edits_origin = self._deferred_edit_origin if self.deferred else type == 7
+        if edits_origin and not files and self._origin_matches(data):
+            # the message already shows exactly this: acknowledge without editing it
+            if self.deferred:
+                self.responded = True
+                # what an edit would have returned, so delete_after still applies
+                return self.message
+            # still a response as far as the caller is concerned
+            type, data, edits_origin, finished = 6, {}, False, True
+        else:
+            finished = type in (4, 7)
+
+        fields = data
+        if not self.deferred:
+            data = {"type": type, "data": data}
+
+        metrics = getattr(self.client, "metrics", None)
+        sent_at = monotonic()
+
         try:
             if self.deferred:
                 res = await self.client.http.edit_response(
@@ -173,9 +247,33 @@ class Interaction:
                     interaction_token=self.interaction_token,
                     data=data,
                     files=files,
+                    deadline=self.response_deadline,
                 )
 
-            if type in (4, 7):
+            if metrics is not None and self._route is not None:
+                acked_at = monotonic()
+                metrics.observe(self._route, "http", acked_at - sent_at)
+                if not (self.deferred or self.responded):
+                    metrics.observe(self._route, "response", acked_at - self._received_at)
+
+            fingerprints = getattr(self.client, "fingerprints", None)
+            if edits_origin:
+                _remember_layout(self.state, self.message.id, components, res)
+                if fingerprints is not None:
+                    fingerprints.update(self.message.id, fields)
+                if self._origin_fields is not None:
+                    self._origin_fields.update(fingerprint_fields(_displayed(fields)))
+            elif isinstance(res, dict) and "id" in res:
+                _remember_layout(self.state, res["id"], components, res)
+                if fingerprints is not None:
+                    fingerprints.update(res["id"], fields)
+
+            # only once the click is acknowledged with type 6 or 7 is @original the clicked
+            # message; before that, or after a type 4 or 5, it is not
+            if type in (6, 7) and not self.deferred:
+                self.message._bind_interaction(self.interaction_token, self.token_expires_at)
+
+            if finished:
                 self.responded = True
             else:
                 self.deferred = True
@@ -187,12 +285,14 @@ class Interaction:
             ) from None
 
         if type in (4, 7) and isinstance(res, dict):
-            return ComponentMessage(
-                state=state,
+            message = ComponentMessage(
+                state=self.state,
                 data=res,
                 channel=self.channel or Object(id=self.channel_id),
                 ephemeral=res.get("flags") == 64,
             )
+            message._bind_interaction(self.interaction_token, self.token_expires_at)
+            return message
         else:
             return res
 
@@ -258,7 +358,25 @@ class Interaction:
         elif res is not None:
             await res.delete(delay=delete_after)
 
+    def _layout(self) -> List[dict]:
+        return self.message._layout()
+
+    async def _edit_origin_components(self, layout: List[dict]):
+        if self.responded:
+            return
+
+        await self.defer(edit_origin=True)
+        await self._send_response(7, {"components": layout})
+
     async def disable_components(self) -> None:
-        await self.edit_origin(
-            components=[row.disable_components() for row in self.message.components],
-        )
+        layout = disabled_layout(self._layout())
+        for row in self.message.components:
+            row.disable_components()
+        await self._edit_origin_components(layout)
+
+    async def update_component(self, custom_id: str, **fields) -> None:
+        layout = patched_layout(self._layout(), custom_id, **fields)
+        if layout is None:
+            raise ValueError(f"message has no component with custom_id {custom_id!r}")
+        await self._edit_origin_components(layout)
+        self.message.components = _parse_components(layout)
@@ -0,0 +1,184 @@
+from typing import Dict, Iterable, List, Tuple, Union, TextIO
+
+import json
+import sys
+from asyncio import Future
+from collections import Counter
+from re import compile as re_compile
+from time import monotonic
+from types import FunctionType, MethodType, ModuleType
+
+
+
+__all__ = ("deep_sizeof", "age_histogram", "top_prefixes", "collect_stats", "debug_dump")
+
+
+AGE_BUCKETS = (1.0, 10.0, 60.0, 300.0, 900.0, 3600.0, 86400.0)
+
+_PREFIX = re_compile(r"[^:/_\-. ]*")
+# shared or foreign state that would make every entry look as big as the whole bot
+_OPAQUE = (type, ModuleType, FunctionType, MethodType, Future)
+
+
+def _attributes(obj) -> list:
+    values = list(vars(obj).values()) if hasattr(obj, "__dict__") else []
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                values.append(getattr(obj, slot))
+    return values
+
+
+def deep_sizeof(obj, *, exclude: Iterable = (), max_objects: int = 100000) -> int:
+    seen = {id(o) for o in exclude}
+    stack = [obj]
+    size = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, _OPAQUE) or hasattr(current, "cr_frame"):
+            continue
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "_state"):
+            # a discord model: count what it holds, not the guild/channel/author it points at
+            stack.extend(value for value in _attributes(current) if not hasattr(value, "_state"))
+        else:
+            stack.extend(_attributes(current))
+    return size
+
+
+def age_histogram(ages: Iterable[float], buckets: Tuple[float, ...] = AGE_BUCKETS) -> Dict:
+    counts = dict.fromkeys([str(b) for b in buckets] + ["+Inf"], 0)
+    for age in ages:
+        for bound in buckets:
+            if age <= bound:
+                counts[str(bound)] += 1
+                break
+        else:
+            counts["+Inf"] += 1
+    return counts
+
+
+def top_prefixes(custom_ids: Iterable[str], top: int = 10) -> List[Tuple[str, int]]:
+    # "poll:1234:yes" and "poll-5678" both count towards "poll"
+    return Counter(_PREFIX.match(custom_id).group() for custom_id in custom_ids).most_common(top)
+
+
+def _summary(ages: List[float]) -> dict:
+    return {
+        "count": len(ages),
+        "oldest": max(ages, default=None),
+        "ages": age_histogram(ages),
+    }
+
+
+def collect_stats(manager, *, top: int = 10, sizes: bool = True) -> dict:
+    now = monotonic()
+    bot = manager.bot
+    exclude = (manager, bot, getattr(bot, "_connection", None), getattr(bot, "http", None))
+
+    callbacks = manager._components_callback
+    callback_stats = _summary([now - info["created_at"] for info in callbacks.values()])
+    callback_stats["limited_uses"] = sum(1 for info in callbacks.values() if info["uses"])
+    callback_stats["top_prefixes"] = top_prefixes(callbacks, top)
+
+    waiters = list(manager._waiters)
+    waiter_stats = _summary([now - waiter.created_at for _, waiter in waiters])
+    waiter_stats["by_event"] = dict(Counter(event for event, _ in waiters))
+    waiter_stats["done"] = sum(1 for _, waiter in waiters if waiter.future.done())
+
+    views = list(manager._views._views.values())
+    view_stats = _summary([now - view._added_at for view in views])
+    view_stats["expiring"] = manager._views.expiring
+    view_stats["by_type"] = dict(Counter(type(view).__name__ for view in views))
+    view_stats["top_prefixes"] = top_prefixes(
+        (custom_id for view in views for custom_id in view._callbacks), top
+    )
+
+    if sizes:
+        callback_stats["approx_bytes"] = deep_sizeof(callbacks, exclude=exclude)
+        waiter_stats["approx_bytes"] = deep_sizeof(manager._waiters._events, exclude=exclude)
+        view_stats["approx_bytes"] = deep_sizeof(manager._views._views, exclude=exclude)
+
+    stats = {"callbacks": callback_stats, "waiters": waiter_stats, "views": view_stats}
+    stats["dispatch"] = manager.dispatch_plan.stats
+    if manager.layouts is not None:
+        stats["layouts"] = manager.layouts.stats
+    if manager.fingerprints is not None:
+        stats["fingerprints"] = manager.fingerprints.stats
+    if manager.dedup is not None:
+        stats["dedup"] = {
+            "tracked": len(manager.dedup),
+            "duplicates": manager.dedup.duplicates,
+            "backend_errors": manager.dedup.backend_errors,
+        }
+    if manager.throttle is not None:
+        stats["throttle"] = manager.throttle.stats
+    if manager.backpressure is not None:
+        stats["backpressure"] = manager.backpressure.stats
+    if manager.user_cache is not None:
+        stats["users"] = manager.user_cache.stats
+    if manager.message_cache is not None:
+        stats["messages"] = manager.message_cache.stats
+    if manager.router is not None:
+        stats["router"] = manager.router.stats
+    if manager.recorder is not None:
+        stats["recorder"] = {"records": manager.recorder.records, "bytes": manager.recorder.bytes}
+    return stats
+
+
+def _name(obj) -> str:
+    return getattr(obj, "__qualname__", None) or type(obj).__qualname__
+
+
+def debug_dump(manager, file: Union[str, TextIO] = None, *, limit: int = 1000) -> dict:
+    now = monotonic()
+    dump = {"stats": collect_stats(manager)}
+
+    dump["callbacks"] = [
+        {
+            "custom_id": custom_id,
+            "uses": info["uses"],
+            "age": now - info["created_at"],
+            "callback": _name(info["callback"]),
+        }
+        for custom_id, info in list(manager._components_callback.items())[:limit]
+    ]
+    dump["waiters"] = [
+        {
+            "event": event,
+            "age": now - waiter.created_at,
+            "key": repr(waiter._key),
+            "predicate": waiter.predicate is not None,
+            "done": waiter.future.done(),
+        }
+        for event, waiter in list(manager._waiters)[:limit]
+    ]
+    dump["views"] = [
+        {
+            "message_id": message_id,
+            "type": type(view).__qualname__,
+            "age": now - view._added_at,
+            "timeout": view.timeout,
+            "custom_ids": list(view._callbacks),
+        }
+        for message_id, view in list(manager._views._views.items())[:limit]
+    ]
+
+    if isinstance(file, str):
+        with open(file, "w", encoding="utf-8") as f:
+            json.dump(dump, f, indent=2, default=repr)
+    elif file is not None:
+        json.dump(dump, file, indent=2, default=repr)
+    return dump
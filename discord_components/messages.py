@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+
+__all__ = ("MessageCache",)
+
+
+class MessageCache:
+    # the bot's own ComponentMessages by id, so a click on one starts from the object the
+    # patched send returned instead of parsing the copy embedded in the interaction again. a
+    # message is only refreshed when the click carries a different edited_timestamp, and each
+    # interaction gets its own shallow copy of it.
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._messages = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+
+    def put(self, message, data: dict):
+        self._messages[message.id] = (message, data.get("edited_timestamp"))
+        self._messages.move_to_end(message.id)
+        if len(self._messages) > self.maxsize:
+            self._messages.popitem(last=False)
+
+    def get(self, data: dict):
+        message_id = int(data["id"])
+        entry = self._messages.get(message_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        message, edited_timestamp = entry
+        if data.get("edited_timestamp") != edited_timestamp:
+            message._refresh(data)
+            self._messages[message_id] = (message, data.get("edited_timestamp"))
+            self.refreshed += 1
+        self._messages.move_to_end(message_id)
+        self.hits += 1
+        return message._copy()
+
+    def discard(self, message_id: int):
+        self._messages.pop(int(message_id), None)
+
+    def clear(self):
+        self._messages.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._messages),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshed": self.refreshed,
+        }
+
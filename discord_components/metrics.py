@@ -0,0 +1,179 @@
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from asyncio import ensure_future, sleep
+
+
+__all__ = ("Histogram", "PipelineMetrics", "render_prometheus", "STAGES")
+
+
+STAGES = ("gateway", "parse", "dispatch", "callback", "http", "response")
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0
+)
+
+
+class Histogram:
+    # log-linear buckets over integer microseconds: 2 ** sub_bucket_bits buckets per
+    # power of two, so every recorded value is kept within ~3% with the default of 5.
+    __slots__ = ("_bits", "_sub", "_counts", "count", "sum", "min", "max")
+
+    def __init__(self, *, sub_bucket_bits: int = 5):
+        self._bits = sub_bucket_bits
+        self._sub = 1 << sub_bucket_bits
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self._bits - 1)
+        return shift * self._sub + (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        shift = max(0, index // self._sub - 1)
+        return ((index - shift * self._sub) << shift) + (1 << shift) - 1
+
+    def record(self, seconds: float):
+        if seconds < 0:
+            seconds = 0.0
+
+        index = self._index(int(seconds * 1e6))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def buckets(self) -> Iterator[Tuple[float, int]]:
+        for index in sorted(self._counts):
+            yield self._upper(index) / 1e6, self._counts[index]
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self.count:
+            return None
+
+        target = max(1, round(self.count * percent / 100))
+        seen = 0
+        for upper, count in self.buckets():
+            seen += count
+            if seen >= target:
+                return min(upper, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+        }
+
+
+class PipelineMetrics:
+    def __init__(
+        self,
+        *,
+        route: Callable[["Interaction"], str] = None,
+        max_routes: int = 1000,
+        sub_bucket_bits: int = 5,
+    ):
+        self.route = route or (lambda interaction: interaction.custom_id)
+        self.max_routes = max_routes
+        self.sub_bucket_bits = sub_bucket_bits
+
+        self._routes = set()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._exporters: List[Callable[[dict], None]] = []
+        self._task = None
+
+    def route_of(self, interaction: "Interaction") -> str:
+        route = self.route(interaction)
+        if route not in self._routes:
+            if len(self._routes) >= self.max_routes:
+                return "other"
+            self._routes.add(route)
+        return route
+
+    def observe(self, route: str, stage: str, seconds: float):
+        histogram = self._histograms.get((route, stage))
+        if histogram is None:
+            histogram = self._histograms[(route, stage)] = Histogram(
+                sub_bucket_bits=self.sub_bucket_bits
+            )
+        histogram.record(seconds)
+
+    def histograms(self) -> Iterator[Tuple[str, str, Histogram]]:
+        for (route, stage), histogram in sorted(self._histograms.items()):
+            yield route, stage, histogram
+
+    def snapshot(self) -> dict:
+        data = {}
+        for route, stage, histogram in self.histograms():
+            data.setdefault(route, {})[stage] = histogram.snapshot()
+        return data
+
+    def reset(self):
+        self._routes.clear()
+        self._histograms.clear()
+
+    def add_exporter(self, exporter: Callable[[dict], None]):
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: Callable[[dict], None]):
+        self._exporters.remove(exporter)
+
+    def export(self):
+        snapshot = self.snapshot()
+        for exporter in self._exporters:
+            exporter(snapshot)
+
+    def start_exporting(self, interval: float = 60.0):
+        if self._task is None or self._task.done():
+            self._task = ensure_future(self._export_loop(interval))
+
+    def stop_exporting(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _export_loop(self, interval: float):
+        while True:
+            await sleep(interval)
+            self.export()
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(
+    metrics: PipelineMetrics,
+    *,
+    name: str = "discord_components_stage_seconds",
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+) -> str:
+    lines = [
+        f"# HELP {name} Time spent in each interaction pipeline stage.",
+        f"# TYPE {name} histogram",
+    ]
+    for route, stage, histogram in metrics.histograms():
+        labels = f'route="{_label(route)}",stage="{stage}"'
+        recorded = list(histogram.buckets())
+        position = cumulative = 0
+        for bound in buckets:
+            while position < len(recorded) and recorded[position][0] <= bound:
+                cumulative += recorded[position][1]
+                position += 1
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,218 @@
+from typing import AsyncIterable, Dict, List, Optional, Sequence, Union
+
+from discord import Embed
+from discord.abc import Messageable
+
+from .component import Button, ButtonStyle, Select, SelectOption, ActionRow
+from .dpy_overrides import ComponentMessage
+from .interaction import Interaction
+from .utils import _get_components_json
+from .view import View
+
+
+__all__ = ("Paginator",)
+
+
+Page = Union[str, Embed, dict]
+
+MAX_OPTIONS = 25
+
+
+def _page_kwargs(page: Page) -> dict:
+    if isinstance(page, Embed):
+        return {"embed": page}
+    elif isinstance(page, dict):
+        return page
+    else:
+        return {"content": str(page)}
+
+
+def _page_payload(page: Page) -> dict:
+    kwargs = _page_kwargs(page)
+    data = {"content": kwargs.get("content")}
+    if kwargs.get("embed") is not None:
+        data["embeds"] = [kwargs["embed"].to_dict()]
+    elif kwargs.get("embeds") is not None:
+        data["embeds"] = [embed.to_dict() for embed in kwargs["embeds"]]
+    else:
+        data["embeds"] = []
+    return data
+
+
+class Paginator(View):
+    def __init__(
+        self,
+        client: "DiscordComponents",
+        pages: Union[Sequence[Page], AsyncIterable[Page]],
+        *,
+        use_select: bool = False,
+        custom_id: str = "paginator",
+        cache_size: int = 50,
+        timeout: Optional[float] = 180.0,
+        disable_on_timeout: bool = True,
+    ):
+        super().__init__(timeout=timeout, disable_on_timeout=disable_on_timeout)
+        self.client = client
+        self.use_select = use_select
+        self.cache_size = max(cache_size, 2)
+        self.index = 0
+
+        self.prev_id = f"{custom_id}:prev"
+        self.next_id = f"{custom_id}:next"
+        self.select_id = f"{custom_id}:select"
+        # a fixed id for the page label too, or every render carries a fresh uuid and no two
+        # payloads for the same page compare equal
+        self.label_id = f"{custom_id}:label"
+        self._callbacks = {
+            self.prev_id: self._prev_callback,
+            self.next_id: self._next_callback,
+            self.select_id: self._select_callback,
+        }
+
+        if hasattr(pages, "__aiter__"):
+            self._iterator = pages.__aiter__()
+            self._pages: Dict[int, Page] = {}
+            self._total: Optional[int] = None
+        else:
+            self._iterator = None
+            self._pages = dict(enumerate(pages))
+            self._total = len(self._pages)
+            if not self._total:
+                raise ValueError("pages must not be empty.")
+
+        self._fetched = len(self._pages)
+        self._payloads: Dict[int, dict] = {}
+
+    @property
+    def total(self) -> Optional[int]:
+        return self._total
+
+    @property
+    def lazy(self) -> bool:
+        return self._iterator is not None
+
+    async def _fetch(self, index: int):
+        while self._total is None and self._fetched <= index:
+            try:
+                page = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                self._total = self._fetched
+                if not self._total:
+                    raise ValueError("pages must not be empty.")
+                break
+
+            self._pages[self._fetched] = page
+            self._fetched += 1
+            while len(self._pages) > self.cache_size:
+                evicted = min(self._pages)
+                del self._pages[evicted]
+                self._payloads.pop(evicted, None)
+
+    def _available(self, index: int) -> bool:
+        return index in self._pages
+
+    def _target(self, index: int, step: int) -> Optional[int]:
+        target = index + step
+        if not self.lazy:
+            return target % self._total
+        if target < 0 or (self._total is not None and target >= self._total):
+            return None
+        if target < self._fetched and not self._available(target):
+            return None
+        return target
+
+    def _option_window(self, index: int) -> range:
+        if self.lazy:
+            start, stop = min(self._pages), self._fetched
+        else:
+            start, stop = 0, self._total
+
+        start = max(start, min(index - MAX_OPTIONS // 2, stop - MAX_OPTIONS))
+        return range(start, min(start + MAX_OPTIONS, stop))
+
+    def _label(self, index: int) -> str:
+        if self._total is None:
+            return f"Page {index + 1}"
+        return f"Page {index + 1}/{self._total}"
+
+    def get_components(self, index: int) -> List[ActionRow]:
+        if self.use_select:
+            return [
+                ActionRow(
+                    Select(
+                        custom_id=self.select_id,
+                        options=[
+                            SelectOption(
+                                label=self._label(i), value=str(i), default=i == index
+                            )
+                            for i in self._option_window(index)
+                        ],
+                    )
+                )
+            ]
+        else:
+            return [
+                ActionRow(
+                    Button(
+                        style=ButtonStyle.blue,
+                        emoji="◀️",
+                        custom_id=self.prev_id,
+                        disabled=self._target(index, -1) is None,
+                    ),
+                    Button(label=self._label(index), custom_id=self.label_id, disabled=True),
+                    Button(
+                        style=ButtonStyle.blue,
+                        emoji="▶️",
+                        custom_id=self.next_id,
+                        disabled=self._target(index, 1) is None,
+                    ),
+                )
+            ]
+
+    async def get_payload(self, index: int) -> dict:
+        if self.lazy:
+            await self._fetch(index + 1)
+
+        payload = self._payloads.get(index)
+        if payload is None:
+            payload = _page_payload(self._pages[index])
+            if not self.lazy:
+                payload["components"] = _get_components_json(self.get_components(index))
+            self._payloads[index] = payload
+
+        if self.lazy:
+            # which neighbours are reachable changes as pages are pulled and evicted
+            return {**payload, "components": _get_components_json(self.get_components(index))}
+        return payload
+
+    async def send(self, channel: Messageable) -> ComponentMessage:
+        if self.lazy:
+            await self._fetch(1)
+
+        message = await channel.send(
+            **_page_kwargs(self._pages[self.index]), components=self.get_components(self.index)
+        )
+        self.client.add_view(self, message)
+        return message
+
+    async def go_to(self, interaction: Interaction, index: int):
+        if index == self.index or not self._available(index):
+            await interaction.defer(edit_origin=True)
+            return
+
+        payload = await self.get_payload(index)
+        self.index = index
+        await interaction._send_response(7, payload)
+
+    async def _prev_callback(self, interaction: Interaction):
+        target = self._target(self.index, -1)
+        await self.go_to(interaction, self.index if target is None else target)
+
+    async def _next_callback(self, interaction: Interaction):
+        if self.lazy:
+            await self._fetch(self.index + 1)
+        target = self._target(self.index, 1)
+        await self.go_to(interaction, self.index if target is None else target)
+
+    async def _select_callback(self, interaction: Interaction):
+        await self.go_to(interaction, int(interaction.values[0]))
@@ -0,0 +1,226 @@
+from typing import BinaryIO, Iterator, Tuple, Union
+
+import json
+import logging
+import random
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from os import urandom
+from time import monotonic
+
+
+__all__ = ("InteractionRecorder", "read_recording")
+
+
+log = logging.getLogger("discord_components.recorder")
+
+
+MAGIC = b"DCRECv1\n"
+# offset from the start of the recording (seconds), length of the compressed record
+_HEADER = struct.Struct("<dI")
+
+# anonymized: ids (timestamp bits kept), tokens, the options a user picked, and all free text
+# below. kept as is: custom_ids, component types, styles, labels and option values as the bot
+# defined them, flags, permissions, locales and timestamps
+_SNOWFLAKE_LISTS = ("roles", "mention_roles")
+_SCRUBBED = (
+    "name",
+    "content",
+    "username",
+    "global_name",
+    "nick",
+    "avatar",
+    "banner",
+    "email",
+    "title",
+    "description",
+    "url",
+    "proxy_url",
+    "filename",
+)
+
+
+class _Anonymizer:
+    def __init__(self, salt: bytes):
+        self.salt = salt
+
+    def _hash(self, value: str) -> int:
+        digest = blake2b(value.encode(), digest_size=8, key=self.salt).digest()
+        return int.from_bytes(digest, "big")
+
+    def snowflake(self, value: str) -> str:
+        # keeps the timestamp bits so ordering and ages survive, replaces worker/process/increment
+        if not value.isdigit():
+            return value
+        return str((int(value) >> 22 << 22) | (self._hash(value) & 0x3FFFFF))
+
+    def token(self, value: str) -> str:
+        digest = blake2b(value.encode(), key=self.salt).hexdigest()
+        return (digest * (len(value) // len(digest) + 1))[: len(value)]
+
+    def text(self, value):
+        if isinstance(value, str):
+            return "x" * len(value)
+        if isinstance(value, dict):
+            return {k: self.text(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.text(v) for v in value]
+        return value
+
+    def __call__(self, value):
+        if isinstance(value, dict):
+            return {k: self._field(k, v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self(v) for v in value]
+        return value
+
+    def _field(self, key: str, value):
+        if value is None:
+            return None
+        if key == "token":
+            return self.token(value)
+        if key == "custom_id":
+            return value
+        if key == "values":
+            # what was picked in a select says something about the user; hashed, not blanked,
+            # so the same choice still shows up as the same value
+            return [self.token(v) for v in value]
+        if key == "id" or key.endswith("_id"):
+            return self.snowflake(value) if isinstance(value, str) else self(value)
+        if key in _SNOWFLAKE_LISTS:
+            return [self.snowflake(v) for v in value]
+        if key == "embeds":
+            return self.text(value)
+        if key in _SCRUBBED:
+            return self.text(value)
+        if key == "discriminator":
+            return "0000"
+        return self(value)
+
+
+class InteractionRecorder:
+    def __init__(
+        self,
+        file: Union[str, BinaryIO],
+        *,
+        anonymize: bool = True,
+        salt: bytes = None,
+        sample: float = 1.0,
+        events: tuple = ("INTERACTION_CREATE",),
+        buffer_size: int = 64 * 1024,
+    ):
+        if isinstance(file, str):
+            self._file = open(file, "wb")
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self._file.write(MAGIC)
+
+        self.anonymize = _Anonymizer(salt or urandom(16)) if anonymize else None
+        self.sample = sample
+        self.events = frozenset(events)
+        self.buffer_size = buffer_size
+        self._started = None
+        # records are written in batches from a thread of their own, so the event loop never
+        # waits on the disk; one thread keeps them in order
+        self._pending = []
+        self._pending_bytes = 0
+        self._writer = None
+        self.records = 0
+        self.bytes = len(MAGIC)
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def record(self, res: dict, received_at: float = None):
+        if self._file is None or res["t"] not in self.events:
+            return
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return
+
+        if received_at is None:
+            received_at = monotonic()
+        if self._started is None:
+            self._started = received_at
+
+        data = res["d"] if self.anonymize is None else self.anonymize(res["d"])
+        body = zlib.compress(
+            json.dumps({"t": res["t"], "d": data}, separators=(",", ":")).encode()
+        )
+        self._pending.append(_HEADER.pack(received_at - self._started, len(body)) + body)
+        self._pending_bytes += _HEADER.size + len(body)
+        self.records += 1
+        self.bytes += _HEADER.size + len(body)
+        if self._pending_bytes >= self.buffer_size:
+            self._write()
+
+    def _write(self):
+        if not self._pending:
+            return
+        chunk = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(1, thread_name_prefix="discord_components-recorder")
+        future = self._writer.submit(self._file.write, chunk)
+        future.add_done_callback(_log_write_error)
+
+    def flush(self):
+        # blocks until everything recorded so far has reached the file
+        if self._file is None:
+            return
+        self._write()
+        if self._writer is not None:
+            self._writer.submit(self._file.flush).result()
+        else:
+            self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        self._write()
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        self._file.flush()
+        if self._owns_file:
+            self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _log_write_error(future):
+    error = future.exception()
+    if error is not None:
+        log.error("could not write interaction records", exc_info=error)
+
+
+def read_recording(file: Union[str, BinaryIO]) -> Iterator[Tuple[float, dict]]:
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            yield from read_recording(f)
+        return
+
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not an interaction recording")
+
+    while True:
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        offset, length = _HEADER.unpack(header)
+        body = file.read(length)
+        if len(body) < length:
+            # a recorder killed mid-write leaves a truncated tail; everything before it is intact
+            return
+        yield offset, json.loads(zlib.decompress(body))
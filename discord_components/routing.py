@@ -0,0 +1,351 @@
+from typing import Dict, Iterable, Optional
+
+import json
+import os
+import struct
+from asyncio import (
+    IncompleteReadError,
+    Lock,
+    TimeoutError,
+    ensure_future,
+    gather,
+    get_running_loop,
+    open_unix_connection,
+    start_unix_server,
+    wait_for,
+)
+from collections import OrderedDict
+
+
+__all__ = ("ClusterRouter", "InMemoryRouter", "LocalSocketRouter")
+
+
+class ClusterRouter:
+    # forwards clicks on custom_ids another node has advertised to that node. ownership is
+    # pushed: add_callback advertises, dropping the callback withdraws, and `prefixes` maps
+    # custom_id prefixes to nodes up front. looking a click up is a dict read, never IPC;
+    # the only IPC on the hot path is handing over a click that does belong elsewhere.
+    # subclasses provide the transport in _broadcast, _sync and _send.
+    def __init__(
+        self,
+        node_id: str,
+        *,
+        prefixes: Dict[str, str] = None,
+        table_size: int = 100000,
+    ):
+        self.node_id = node_id
+        self.prefixes = dict(prefixes or {})
+        self.table_size = table_size
+
+        self._manager = None
+        self._owners = OrderedDict()
+        self._tasks = set()
+        self._starting = None
+        self.started = False
+        self.forwarded = 0
+        self.forward_failures = 0
+        self.delivered = 0
+
+    def bind(self, manager):
+        self._manager = manager
+
+    def _owned(self) -> list:
+        return list(self._manager._components_callback)
+
+    async def start(self):
+        # READY starts the router, but so do the first route() and advertise(), like
+        # ProcessPool.submit: a manager created after READY never sees that event. all of them
+        # share one start
+        if self._starting is None:
+            self._starting = ensure_future(self._start())
+        try:
+            await self._starting
+        except Exception:
+            self._starting = None
+            raise
+
+    async def _start(self):
+        # everything registered before this is exchanged here in one go
+        self.started = True
+        await self._sync()
+
+    def _start_soon(self):
+        # advertise() isn't a coroutine; before the loop runs there is nothing to do, READY
+        # will start the router
+        try:
+            get_running_loop()
+        except RuntimeError:
+            return
+        self._spawn(self.start())
+
+    async def close(self):
+        self.started = False
+        self._starting = None
+
+    async def _broadcast(self, frame: dict):
+        raise NotImplementedError
+
+    async def _sync(self):
+        raise NotImplementedError
+
+    async def _send(self, node_id: str, res: dict, received_at: float) -> bool:
+        raise NotImplementedError
+
+    def _spawn(self, coro):
+        task = ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _announce(self, op: str, custom_id: str):
+        if self.started:
+            self._spawn(self._broadcast({"op": op, "node": self.node_id, "ids": [custom_id]}))
+        elif self._starting is None:
+            # starting syncs every registered id, this one included
+            self._start_soon()
+
+    def advertise(self, custom_id: str):
+        self._announce("advertise", custom_id)
+
+    def withdraw(self, custom_id: str):
+        self._announce("withdraw", custom_id)
+
+    def learn(self, node_id: str, custom_ids: Iterable[str]):
+        owners = self._owners
+        for custom_id in custom_ids:
+            owners[custom_id] = node_id
+            owners.move_to_end(custom_id)
+        while len(owners) > self.table_size:
+            owners.popitem(last=False)
+
+    def forget(self, node_id: str, custom_ids: Iterable[str] = None):
+        # without ids, everything the node owned: it has gone away
+        if custom_ids is None:
+            custom_ids = [key for key, owner in self._owners.items() if owner == node_id]
+        for custom_id in custom_ids:
+            if self._owners.get(custom_id) == node_id:
+                del self._owners[custom_id]
+
+    def _apply(self, frame: dict):
+        if frame["op"] == "advertise":
+            self.learn(frame["node"], frame["ids"])
+        elif frame["op"] == "withdraw":
+            self.forget(frame["node"], frame["ids"])
+
+    def owner_of(self, custom_id: str) -> Optional[str]:
+        owner = self._owners.get(custom_id)
+        if owner is None and self.prefixes:
+            for prefix, node_id in self.prefixes.items():
+                if custom_id.startswith(prefix):
+                    return node_id
+        return owner
+
+    async def route(self, res: dict, received_at: float) -> bool:
+        if "forwarded_from" in res:
+            return False
+        if not self.started:
+            try:
+                await self.start()
+            except OSError:
+                # can't listen: handle it here rather than lose the click
+                return False
+
+        owner = self.owner_of(res["d"]["data"]["custom_id"])
+        if owner is None or owner == self.node_id:
+            return False
+
+        res["forwarded_from"] = self.node_id
+        if await self._send(owner, res, received_at):
+            self.forwarded += 1
+            return True
+
+        # the owner is gone; whatever it advertised goes with it
+        del res["forwarded_from"]
+        self.forward_failures += 1
+        self.forget(owner)
+        return False
+
+    async def deliver(self, res: dict, received_at: float):
+        self.delivered += 1
+        await self._manager._intake(res, received_at)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "routes": len(self._owners),
+            "prefixes": len(self.prefixes),
+            "forwarded": self.forwarded,
+            "forward_failures": self.forward_failures,
+            "delivered": self.delivered,
+        }
+
+
+class InMemoryRouter(ClusterRouter):
+    # every node in one process shares `nodes`; handy for tests and single-host setups
+    def __init__(self, node_id: str, nodes: Dict[str, "InMemoryRouter"], **options):
+        super().__init__(node_id, **options)
+        self.nodes = nodes
+        nodes[node_id] = self
+
+    def _peers(self):
+        return [node for node in self.nodes.values() if node is not self]
+
+    def advertise(self, custom_id: str):
+        if not self.started and self._starting is None:
+            self._start_soon()
+        for node in self._peers():
+            node.learn(self.node_id, [custom_id])
+
+    def withdraw(self, custom_id: str):
+        for node in self._peers():
+            node.forget(self.node_id, [custom_id])
+
+    async def _sync(self):
+        owned = self._owned()
+        for node in self._peers():
+            node.learn(self.node_id, owned)
+            if node._manager is not None:
+                self.learn(node.node_id, node._owned())
+
+    async def _send(self, node_id: str, res: dict, received_at: float) -> bool:
+        node = self.nodes.get(node_id)
+        if node is None:
+            return False
+        self._spawn(node.deliver(res, received_at))
+        return True
+
+    async def close(self):
+        await super().close()
+        self.nodes.pop(self.node_id, None)
+        for node in self.nodes.values():
+            node.forget(self.node_id)
+
+
+_FRAME = struct.Struct(">I")
+
+
+async def _read_frame(reader) -> dict:
+    (length,) = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    return json.loads(await reader.readexactly(length))
+
+
+def _write_frame(writer, data: dict):
+    body = json.dumps(data, separators=(",", ":")).encode()
+    writer.write(_FRAME.pack(len(body)) + body)
+
+
+class LocalSocketRouter(ClusterRouter):
+    # each node listens on <directory>/<node_id>.sock; peers are whatever other sockets are
+    # in the directory. frames are a 4-byte length followed by JSON.
+    def __init__(self, node_id: str, directory: str, *, timeout: float = 0.5, **options):
+        super().__init__(node_id, **options)
+        self.directory = directory
+        self.timeout = timeout
+        self.path = os.path.join(directory, f"{node_id}.sock")
+
+        self._server = None
+        self._connections: Dict[str, tuple] = {}
+        self._served = set()
+
+    async def _start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await start_unix_server(self._serve, path=self.path)
+        await super()._start()
+
+    async def close(self):
+        await super().close()
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._served):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        for _, writer, _ in self._connections.values():
+            writer.close()
+        self._connections.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _peers(self):
+        return [
+            name[: -len(".sock")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".sock") and name != f"{self.node_id}.sock"
+        ]
+
+    async def _serve(self, reader, writer):
+        self._served.add(writer)
+        try:
+            while True:
+                frame = await _read_frame(reader)
+                if frame["op"] == "deliver":
+                    self._spawn(self.deliver(frame["res"], frame["received_at"]))
+                    _write_frame(writer, {"ok": True})
+                elif frame["op"] == "sync":
+                    self.learn(frame["node"], frame["ids"])
+                    _write_frame(writer, {"ok": True, "ids": self._owned()})
+                else:
+                    self._apply(frame)
+                    _write_frame(writer, {"ok": True})
+                await writer.drain()
+        except (IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._served.discard(writer)
+            writer.close()
+
+    async def _request(self, node_id: str, data: dict) -> dict:
+        # raises on any failure, after dropping the connection: a late answer left in the
+        # stream would otherwise be read as the reply to the next request
+        connection = self._connections.get(node_id)
+        try:
+            if connection is None:
+                try:
+                    reader, writer = await wait_for(
+                        open_unix_connection(os.path.join(self.directory, f"{node_id}.sock")),
+                        self.timeout,
+                    )
+                except TimeoutError:
+                    # nothing was sent, so unlike a slow answer this is a plain failure
+                    raise ConnectionError(f"could not connect to {node_id}") from None
+                connection = self._connections[node_id] = (reader, writer, Lock())
+
+            reader, writer, lock = connection
+            async with lock:
+                _write_frame(writer, data)
+                await writer.drain()
+                return await wait_for(_read_frame(reader), self.timeout)
+        except BaseException:
+            dropped = self._connections.pop(node_id, None)
+            if dropped is not None:
+                dropped[1].close()
+            raise
+
+    async def _try(self, node_id: str, data: dict) -> Optional[dict]:
+        try:
+            return await self._request(node_id, data)
+        except (OSError, IncompleteReadError, TimeoutError):
+            return None
+
+    async def _broadcast(self, frame: dict):
+        await gather(*(self._try(peer, frame) for peer in self._peers()))
+
+    async def _sync(self):
+        frame = {"op": "sync", "node": self.node_id, "ids": self._owned()}
+        peers = self._peers()
+        answers = await gather(*(self._try(peer, frame) for peer in peers))
+        for peer, answer in zip(peers, answers):
+            if answer is not None:
+                self.learn(peer, answer["ids"])
+
+    async def _send(self, node_id: str, res: dict, received_at: float) -> bool:
+        try:
+            await self._request(
+                node_id, {"op": "deliver", "res": res, "received_at": received_at}
+            )
+        except TimeoutError:
+            # the peer may well have it already; handling it here as well could run it twice
+            return True
+        except (OSError, IncompleteReadError):
+            return False
+        return True
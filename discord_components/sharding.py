@@ -0,0 +1,190 @@
+from typing import Dict
+
+from asyncio import ensure_future, get_event_loop
+from collections import deque
+from time import monotonic
+
+from .metrics import Histogram
+
+
+__all__ = ("ShardScheduler",)
+
+
+def shard_of(data: dict, shard_count: int) -> int:
+    guild_id = data.get("guild_id")
+    if not guild_id or shard_count <= 1:
+        return 0  # DMs always arrive on shard 0
+    return (int(guild_id) >> 22) % shard_count
+
+
+class _Shard:
+    __slots__ = ("id", "queue", "lane", "enqueued", "processed", "failed", "max_depth", "wait")
+
+    def __init__(self, shard_id: int, lane: "_Lane"):
+        self.id = shard_id
+        self.queue = deque()
+        self.lane = lane
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.wait = Histogram()
+
+
+class _Lane:
+    # a set of worker tasks draining the shards in `ready` round-robin, one interaction at a
+    # time; a shard is in `ready` exactly when its queue is non-empty
+    __slots__ = ("ready", "idle", "tasks", "closed")
+
+    def __init__(self):
+        self.ready = deque()
+        self.idle = deque()
+        self.tasks = []
+        self.closed = False
+
+    def wake(self, everyone: bool = False):
+        while self.idle:
+            future = self.idle.popleft()
+            if not future.done():
+                future.set_result(None)
+                if not everyone:
+                    return
+
+
+class ShardScheduler:
+    def __init__(self, *, workers: int = 32, shard_count: int = None):
+        self.workers = workers
+        self.shard_count = shard_count
+
+        self._bot = None
+        self._handler = None
+        self._backpressure = None
+        self._shards: Dict[int, _Shard] = {}
+        self._shared = _Lane()
+        self._pinned: Dict[int, _Lane] = {}
+
+    def bind(self, manager):
+        self._bot = manager.bot
+        self._handler = manager._handle_admitted
+        self._backpressure = manager.backpressure
+
+    def _get_shard_count(self) -> int:
+        return self.shard_count or getattr(self._bot, "shard_count", None) or 1
+
+    def _get_shard(self, shard_id: int) -> _Shard:
+        shard = self._shards.get(shard_id)
+        if shard is None:
+            shard = self._shards[shard_id] = _Shard(shard_id, self._shared)
+        return shard
+
+    def submit(self, res: dict, received_at: float):
+        shard = self._get_shard(shard_of(res["d"], self._get_shard_count()))
+        lane = shard.lane
+        if not lane.tasks:
+            self._start(lane, self.workers)
+
+        shard.queue.append((res, received_at))
+        shard.enqueued += 1
+        if len(shard.queue) > shard.max_depth:
+            shard.max_depth = len(shard.queue)
+        if len(shard.queue) == 1:
+            lane.ready.append(shard)
+            lane.wake()
+
+    def _start(self, lane: _Lane, workers: int):
+        lane.tasks = [ensure_future(self._work(lane)) for _ in range(workers)]
+
+    async def _work(self, lane: _Lane):
+        loop = get_event_loop()
+        while not lane.closed:
+            if not lane.ready:
+                future = loop.create_future()
+                lane.idle.append(future)
+                await future
+                continue
+
+            shard = lane.ready.popleft()
+            res, received_at = shard.queue.popleft()
+            if shard.queue:
+                lane.ready.append(shard)
+            if lane.ready:
+                lane.wake()
+
+            shard.wait.record(monotonic() - received_at)
+            try:
+                await self._handler(res, received_at)
+            except Exception:
+                shard.failed += 1
+                await self._bot.on_error("socket_response", res)
+            shard.processed += 1
+
+    def pin(self, shard_id: int, workers: int = 1):
+        # give the shard its own workers, so a burst anywhere else can't hold it up
+        if shard_id in self._pinned:
+            return
+
+        shard = self._get_shard(shard_id)
+        lane = self._pinned[shard_id] = _Lane()
+        self._start(lane, workers)
+        self._move(shard, lane)
+
+    def unpin(self, shard_id: int):
+        lane = self._pinned.pop(shard_id, None)
+        if lane is None:
+            return
+
+        self._move(self._shards[shard_id], self._shared)
+        # workers finish what they're running and exit; nothing is cancelled mid-callback
+        lane.closed = True
+        lane.wake(everyone=True)
+
+    def _move(self, shard: _Shard, lane: _Lane):
+        # the shared lane only gets workers on its first submit, which may not have happened
+        if shard.queue and not lane.tasks:
+            self._start(lane, self.workers)
+        if shard in shard.lane.ready:
+            shard.lane.ready.remove(shard)
+            lane.ready.append(shard)
+            lane.wake()
+        shard.lane = lane
+
+    @property
+    def pinned(self) -> Dict[int, int]:
+        return {shard_id: len(lane.tasks) for shard_id, lane in self._pinned.items()}
+
+    def depth(self, shard_id: int = None) -> int:
+        if shard_id is not None:
+            shard = self._shards.get(shard_id)
+            return len(shard.queue) if shard is not None else 0
+        return sum(len(shard.queue) for shard in self._shards.values())
+
+    @property
+    def stats(self) -> Dict[int, dict]:
+        return {
+            shard.id: {
+                "depth": len(shard.queue),
+                "max_depth": shard.max_depth,
+                "enqueued": shard.enqueued,
+                "processed": shard.processed,
+                "failed": shard.failed,
+                "pinned": shard.id in self._pinned,
+                "wait": shard.wait.snapshot(),
+            }
+            for shard in self._shards.values()
+        }
+
+    def close(self):
+        for lane in [self._shared, *self._pinned.values()]:
+            lane.closed = True
+            for task in lane.tasks:
+                task.cancel()
+            lane.tasks = []
+        self._pinned.clear()
+        self._shared = _Lane()
+        for shard in self._shards.values():
+            shard.lane = self._shared
+            # each of these holds a slot admit() gave out, which _handle_admitted won't return
+            if self._backpressure is not None:
+                for _ in shard.queue:
+                    self._backpressure.release()
+            shard.queue.clear()
@@ -0,0 +1,80 @@
+from typing import Hashable, Optional
+
+from collections import OrderedDict
+from time import monotonic
+
+
+__all__ = ("ClickThrottle",)
+
+
+def _click_key(data: dict) -> tuple:
+    user = data["member"]["user"] if data.get("member") else data["user"]
+    return (user["id"], data["message"]["id"], data["data"]["custom_id"])
+
+
+class ClickThrottle:
+    def __init__(
+        self,
+        *,
+        debounce: float = None,
+        rate: int = None,
+        per: float = None,
+        max_keys: int = 10000,
+    ):
+        if (rate is None) != (per is None):
+            raise ValueError("rate and per must be passed together.")
+
+        self.debounce = debounce
+        self.rate = rate
+        self.per = per
+        self.max_keys = max_keys
+
+        self._keys = OrderedDict()
+        self.accepted = 0
+        self.debounced = 0
+        self.throttled = 0
+
+    @property
+    def shed(self) -> int:
+        return self.debounced + self.throttled
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "accepted": self.accepted,
+            "debounced": self.debounced,
+            "throttled": self.throttled,
+            "tracked_keys": len(self._keys),
+        }
+
+    def check(self, key: Hashable, now: float = None) -> Optional[str]:
+        if now is None:
+            now = monotonic()
+
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [None, float(self.rate or 0), now]
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+
+        last_accepted, allowance, last_check = state
+
+        if self.debounce is not None and last_accepted is not None:
+            if now - last_accepted < self.debounce:
+                self.debounced += 1
+                return "debounced"
+
+        if self.rate is not None:
+            allowance = min(self.rate, allowance + (now - last_check) * self.rate / self.per)
+            state[2] = now
+            if allowance < 1:
+                state[1] = allowance
+                self.throttled += 1
+                return "throttled"
+            state[1] = allowance - 1
+
+        state[0] = now
+        self.accepted += 1
+        return None
@@ -0,0 +1,93 @@
+from typing import Hashable, List
+
+from math import ceil
+from time import monotonic
+
+
+__all__ = ("TimingWheel",)
+
+
+class TimingWheel:
+    # O(1) schedule/cancel; a tick touches one level-0 slot and, every slots ** n ticks,
+    # cascades one slot of level n down. Defaults cover timeouts up to ~194 days.
+
+    def __init__(self, *, tick: float = 1.0, slots: int = 64, levels: int = 4):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._entries = {}
+        self._ticks = 0
+        self._origin = monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._entries
+
+    def _place(self, item: Hashable, expires: int):
+        delta = expires - self._ticks
+        span = self.slots
+        level = 0
+        while delta >= span and level < self.levels - 1:
+            span *= self.slots
+            level += 1
+
+        # beyond the top level's range the entry is parked on the furthest slot and
+        # re-placed when it comes around.
+        target = min(expires, self._ticks + span - 1)
+        slot = (target // self.slots ** level) % self.slots
+        self._wheels[level][slot].add(item)
+        self._entries[item] = (level, slot, expires)
+
+    def schedule(self, item: Hashable, delay: float):
+        self.cancel(item)
+        expires = ceil((monotonic() + delay - self._origin) / self.tick)
+        self._place(item, max(expires, self._ticks + 1))
+
+    def cancel(self, item: Hashable) -> bool:
+        entry = self._entries.pop(item, None)
+        if entry is None:
+            return False
+
+        level, slot, _ = entry
+        self._wheels[level][slot].discard(item)
+        return True
+
+    def _step(self) -> List[Hashable]:
+        self._ticks += 1
+        ticks = self._ticks
+
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if ticks % span:
+                continue
+
+            slot = (ticks // span) % self.slots
+            bucket, self._wheels[level][slot] = self._wheels[level][slot], set()
+            for item in bucket:
+                self._place(item, self._entries[item][2])
+
+        slot = ticks % self.slots
+        bucket, self._wheels[0][slot] = self._wheels[0][slot], set()
+
+        expired = []
+        for item in bucket:
+            if self._entries[item][2] > ticks:
+                self._place(item, self._entries[item][2])
+            else:
+                del self._entries[item]
+                expired.append(item)
+        return expired
+
+    def advance(self, now: float = None) -> List[Hashable]:
+        if now is None:
+            now = monotonic()
+
+        target = int((now - self._origin) // self.tick)
+        expired = []
+        while self._ticks < target:
+            expired.extend(self._step())
+        return expired
@@ -0,0 +1,117 @@
+from typing import Optional
+
+import logging
+from contextvars import ContextVar
+
+
+__all__ = (
+    "InteractionContext",
+    "InteractionContextFilter",
+    "current_interaction",
+    "get_tracer",
+    "set_tracer",
+    "span",
+)
+
+
+class InteractionContext:
+    __slots__ = ("interaction_id", "custom_id", "guild_id", "channel_id", "user_id", "received_at")
+
+    def __init__(
+        self,
+        *,
+        interaction_id: int,
+        custom_id: str = None,
+        guild_id: int = None,
+        channel_id: int = None,
+        user_id: int = None,
+        received_at: float = None,
+    ):
+        self.interaction_id = interaction_id
+        self.custom_id = custom_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.received_at = received_at
+
+    @classmethod
+    def from_payload(cls, data: dict, received_at: float = None) -> "InteractionContext":
+        user = data["member"]["user"] if "member" in data else data.get("user")
+        return cls(
+            interaction_id=int(data["id"]),
+            custom_id=data["data"].get("custom_id"),
+            guild_id=int(data["guild_id"]) if data.get("guild_id") else None,
+            channel_id=int(data["channel_id"]) if data.get("channel_id") else None,
+            user_id=int(user["id"]) if user else None,
+            received_at=received_at,
+        )
+
+    def to_attributes(self) -> dict:
+        attributes = {"discord.interaction.id": self.interaction_id}
+        if self.custom_id is not None:
+            attributes["discord.interaction.custom_id"] = self.custom_id
+        if self.guild_id is not None:
+            attributes["discord.guild.id"] = self.guild_id
+        if self.channel_id is not None:
+            attributes["discord.channel.id"] = self.channel_id
+        if self.user_id is not None:
+            attributes["discord.user.id"] = self.user_id
+        return attributes
+
+    def __repr__(self) -> str:
+        return (
+            f"<InteractionContext interaction_id={self.interaction_id} "
+            f"custom_id={self.custom_id!r} guild_id={self.guild_id} user_id={self.user_id}>"
+        )
+
+
+_current_interaction: ContextVar = ContextVar("discord_components_interaction", default=None)
+
+
+def current_interaction() -> Optional[InteractionContext]:
+    return _current_interaction.get()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_tracer = None
+
+
+def set_tracer(tracer):
+    # anything with an opentelemetry-style start_as_current_span(name, attributes=...)
+    global _tracer
+    _tracer = tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name: str, attributes: dict = None):
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+
+    context = _current_interaction.get()
+    if context is not None:
+        attributes = {**context.to_attributes(), **(attributes or {})}
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+class InteractionContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _current_interaction.get()
+        record.interaction_id = context and context.interaction_id
+        record.custom_id = context and context.custom_id
+        record.guild_id = context and context.guild_id
+        record.user_id = context and context.user_id
+        return True
@@ -0,0 +1,82 @@
+from typing import Optional, Union
+
+from collections import OrderedDict
+
+from discord import Guild, Member, User
+from discord.state import ConnectionState
+
+
+__all__ = ("UserCache",)
+
+
+def _user_from_payload(
+    state: ConnectionState, guild: Optional[Guild], data: dict
+) -> Union[User, Member]:
+    if guild:
+        return Member(state=state, guild=guild, data=data["member"])
+    elif data.get("member"):
+        return User(state=state, data=data["member"]["user"])
+    else:
+        return User(state=state, data=data["user"])
+
+
+class UserCache:
+    # members and users built from interactions, keyed by (guild_id, user_id). a hit is updated
+    # in place from the newer payload instead of allocating a fresh object per click.
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._users = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(
+        self, state: ConnectionState, guild: Optional[Guild], data: dict
+    ) -> Union[User, Member]:
+        user_data = data["member"]["user"] if data.get("member") else data["user"]
+        key = (guild.id if guild else None, int(user_data["id"]))
+
+        cached = self._users.get(key)
+        # a guild that wasn't cached when the user was stored gets a proper Member now, and a
+        # Member keeps pointing at the Guild it was built with, which goes stale once the
+        # guild is replaced on a reconnect
+        if cached is not None and (
+            cached.guild is guild if isinstance(cached, Member) else guild is None
+        ):
+            self._users.move_to_end(key)
+            self.hits += 1
+            if guild:
+                cached._update(data["member"])
+                cached._update_inner_user(user_data)
+            else:
+                cached._update(user_data)
+            return cached
+
+        self.misses += 1
+        user = self._users[key] = _user_from_payload(state, guild, data)
+        self._users.move_to_end(key)
+        if len(self._users) > self.maxsize:
+            self._users.popitem(last=False)
+        return user
+
+    def discard(self, guild_id: Optional[int], user_id: int):
+        self._users.pop((guild_id, user_id), None)
+
+    def clear(self):
+        self._users.clear()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
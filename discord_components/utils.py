@@ -3,12 +3,23 @@ from typing import List, Union, Optional
 from discord import File
 
 from aiohttp import FormData
+from collections import OrderedDict
+from hashlib import blake2b
 from json import dumps
 
 from .component import ActionRow, Component
 
 
-__all__ = ("_get_components_json",)
+__all__ = (
+    "_get_components_json",
+    "LayoutCache",
+    "disabled_layout",
+    "patched_layout",
+    "PayloadFingerprints",
+    "fingerprint",
+    "fingerprint_fields",
+    "fields_match",
+)
 
 
 def _get_components_json(
@@ -52,3 +63,141 @@ def _form_files(
                 }
             )
     return form
+
+
+class LayoutCache:
+    # the last component layout a manager set on a message, exactly as it was sent, so
+    # disabling or tweaking one component needs no to_dict() of the parsed message. opt-in
+    # with DiscordComponents(layout_cache=LayoutCache()). each layout is stored with the
+    # edited_timestamp Discord answered with and only used for a message showing that same
+    # timestamp: after an edit made anywhere else the message's own components win.
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, message_id: int, edited_at=None) -> Optional[List[dict]]:
+        entry = self._layouts.get(int(message_id))
+        if entry is None or entry[0] != edited_at:
+            self.misses += 1
+            return None
+
+        self._layouts.move_to_end(int(message_id))
+        self.hits += 1
+        return entry[1]
+
+    def put(self, message_id: int, layout: List[dict], edited_at=None):
+        self._layouts[int(message_id)] = (edited_at, layout)
+        self._layouts.move_to_end(int(message_id))
+        if len(self._layouts) > self.maxsize:
+            self._layouts.popitem(last=False)
+
+    def discard(self, message_id: int):
+        self._layouts.pop(int(message_id), None)
+
+    def clear(self):
+        self._layouts.clear()
+
+    def __contains__(self, message_id: int) -> bool:
+        return int(message_id) in self._layouts
+
+    def __len__(self) -> int:
+        return len(self._layouts)
+
+    @property
+    def stats(self) -> dict:
+        return {"cached": len(self._layouts), "hits": self.hits, "misses": self.misses}
+
+
+def disabled_layout(layout: List[dict]) -> List[dict]:
+    return [
+        {**row, "components": [{**component, "disabled": True} for component in row["components"]]}
+        for row in layout
+    ]
+
+
+def patched_layout(layout: List[dict], custom_id: str, **fields) -> Optional[List[dict]]:
+    found = False
+    rows = []
+    for row in layout:
+        components = []
+        for component in row["components"]:
+            if component.get("custom_id") == custom_id:
+                component = {**component, **fields}
+                found = True
+            components.append(component)
+        rows.append({**row, "components": components})
+    return rows if found else None
+
+
+def fingerprint(value) -> bytes:
+    return blake2b(
+        dumps(value, sort_keys=True, separators=(",", ":")).encode(), digest_size=8
+    ).digest()
+
+
+IGNORED_FIELDS = frozenset(("tts", "allowed_mentions"))
+
+
+def fingerprint_fields(data: dict) -> dict:
+    return {key: fingerprint(value) for key, value in data.items() if key not in IGNORED_FIELDS}
+
+
+def fields_match(recorded: dict, data: dict) -> bool:
+    compared = False
+    for key, value in data.items():
+        if key in IGNORED_FIELDS:
+            continue
+        # a field never recorded for this message counts as changed
+        if recorded.get(key) != fingerprint(value):
+            return False
+        compared = True
+    return compared
+
+
+class PayloadFingerprints:
+    # per message, a hash of every displayed field the bot last sent. an edit whose fields
+    # all hash the same would leave the message as it is, so it can be skipped. a manager
+    # only has one with DiscordComponents(skip_unchanged_edits=True): the record only sees
+    # edits made through that manager, so it is only right when nothing else
+    # (discord.Message.edit, raw http calls, other processes, moderators) edits its messages.
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._messages = OrderedDict()
+        self.checked = 0
+        self.skipped = 0
+
+    def compare(self, recorded: dict, data: dict) -> bool:
+        self.checked += 1
+        if fields_match(recorded, data):
+            self.skipped += 1
+            return True
+        return False
+
+    def matches(self, message_id: int, data: dict) -> bool:
+        recorded = self._messages.get(int(message_id))
+        return recorded is not None and self.compare(recorded, data)
+
+    def update(self, message_id: int, data: dict):
+        recorded = self._messages.get(int(message_id))
+        if recorded is None:
+            recorded = self._messages[int(message_id)] = {}
+        self._messages.move_to_end(int(message_id))
+        if len(self._messages) > self.maxsize:
+            self._messages.popitem(last=False)
+
+        recorded.update(fingerprint_fields(data))
+
+    def discard(self, message_id: int):
+        self._messages.pop(int(message_id), None)
+
+    def clear(self):
+        self._messages.clear()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    @property
+    def stats(self) -> dict:
+        return {"tracked": len(self._messages), "checked": self.checked, "skipped": self.skipped}
@@ -0,0 +1,181 @@
+from typing import Callable, Dict, List, Optional
+
+import logging
+from asyncio import ensure_future, sleep
+from time import monotonic
+
+from .component import ActionRow, Component
+from .dpy_overrides import ComponentMessage
+from .interaction import Interaction
+from .timer import TimingWheel
+from .bulk import disable_components_bulk
+
+
+__all__ = ("View", "ViewStore")
+
+
+log = logging.getLogger("discord_components.view")
+
+
+class View:
+    def __init__(self, *, timeout: Optional[float] = 180.0, disable_on_timeout: bool = True):
+        self.timeout = timeout
+        self.disable_on_timeout = disable_on_timeout
+
+        self.message: Optional[ComponentMessage] = None
+        self.rows: List[ActionRow] = []
+
+        self._callbacks: Dict[str, Callable] = {}
+        self._store: Optional["ViewStore"] = None
+        self._added_at: Optional[float] = None
+
+    @property
+    def components(self) -> List[ActionRow]:
+        return [ActionRow(*row) for row in self.rows]
+
+    @property
+    def active(self) -> bool:
+        return self._store is not None
+
+    def add_component(self, component: Component, callback=None, *, row: int = None) -> Component:
+        if row is None:
+            if not self.rows or len(self.rows[-1]) >= 5:
+                self.rows.append(ActionRow())
+            row = len(self.rows) - 1
+        while len(self.rows) <= row:
+            self.rows.append(ActionRow())
+
+        self.rows[row].append(component)
+        if callback is not None:
+            self._callbacks[component.custom_id] = callback
+        return component
+
+    def refresh(self):
+        if self._store is not None:
+            self._store._schedule(self)
+
+    def stop(self):
+        if self._store is not None:
+            self._store.remove(self)
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        return True
+
+    async def on_timeout(self):
+        pass
+
+    async def _dispatch(self, interaction: Interaction, run=None) -> bool:
+        callback = self._callbacks.get(interaction.custom_id)
+        if callback is None or not await self.interaction_check(interaction):
+            return False
+
+        self.refresh()
+        if run is None:
+            await callback(interaction)
+        else:
+            await run(callback, interaction)
+        return True
+
+
+class ViewStore:
+    def __init__(self, *, tick: float = 1.0, slots: int = 64, levels: int = 4):
+        self._views: Dict[int, View] = {}
+        self._wheel = TimingWheel(tick=tick, slots=slots, levels=levels)
+        self._task = None
+        self._expiring = set()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    @property
+    def expiring(self) -> int:
+        return len(self._wheel)
+
+    def add(self, view: View, message: ComponentMessage) -> View:
+        if view._store is not None:
+            view._store.remove(view)
+        # one view per message: the one it replaces must not expire later and take this with it
+        replaced = self._views.get(message.id)
+        if replaced is not None:
+            self.remove(replaced)
+
+        view.message = message
+        view._store = self
+        view._added_at = monotonic()
+        self._views[message.id] = view
+        self._schedule(view)
+        return view
+
+    def remove(self, view: View):
+        if view._store is not self:
+            return
+
+        self._wheel.cancel(view)
+        if self._views.get(view.message.id) is view:
+            del self._views[view.message.id]
+        view._store = None
+
+    def get(self, message_id: int) -> Optional[View]:
+        return self._views.get(message_id)
+
+    async def dispatch(self, interaction: Interaction, run=None) -> bool:
+        view = self._views.get(interaction.message.id)
+        if view is None:
+            return False
+
+        return await view._dispatch(interaction, run)
+
+    def _schedule(self, view: View):
+        if view.timeout is None:
+            self._wheel.cancel(view)
+            return
+
+        self._wheel.schedule(view, view.timeout)
+        if self._task is None or self._task.done():
+            self._task = ensure_future(self._run())
+
+    async def _run(self):
+        while len(self._wheel):
+            await sleep(self._wheel.tick)
+            expired = self._wheel.advance()
+            if expired:
+                self._expire(expired)
+
+    def _expire(self, views: List[View]):
+        for view in views:
+            if self._views.get(view.message.id) is view:
+                del self._views[view.message.id]
+            view._store = None
+
+        messages = [view.message for view in views if view.disable_on_timeout]
+        if messages:
+            self._spawn(self._disable(messages), "disabling expired views")
+
+        for view in views:
+            if type(view).on_timeout is not View.on_timeout:
+                self._spawn(view.on_timeout(), f"{type(view).__name__}.on_timeout")
+
+    def _spawn(self, coro, what: str):
+        # held until done, and whatever it raised is logged rather than lost with the task
+        task = ensure_future(coro)
+        self._expiring.add(task)
+        task.add_done_callback(lambda task: self._finished(task, what))
+
+    def _finished(self, task, what: str):
+        self._expiring.discard(task)
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            log.error("%s failed", what, exc_info=error)
+
+    async def _disable(self, messages: List[ComponentMessage]):
+        report = await disable_components_bulk(messages)
+        for result in report["results"]:
+            if result["error"] is not None:
+                log.warning(
+                    "could not disable the components of message %s",
+                    result["message_id"],
+                    exc_info=result["error"],
+                )
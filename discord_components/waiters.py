@@ -0,0 +1,99 @@
+from typing import Dict, Iterator, Tuple
+
+from asyncio import Future, get_event_loop
+from operator import attrgetter
+from time import monotonic
+
+from .ext.filters import Filter
+
+
+__all__ = ("WaiterIndex",)
+
+
+class _Waiter:
+    __slots__ = ("future", "predicate", "created_at", "_index", "_key")
+
+    def __init__(self, future: Future, predicate, index: dict, key):
+        self.future = future
+        self.predicate = predicate
+        self.created_at = monotonic()
+        self._index = index
+        self._key = key
+
+
+class WaiterIndex:
+    def __init__(self):
+        # event -> attrs -> (getter, values -> [waiters])
+        self._events: Dict[str, Dict[Tuple[str, ...], tuple]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Tuple[str, _Waiter]]:
+        for event, groups in self._events.items():
+            for _, index in groups.values():
+                for waiters in index.values():
+                    for waiter in waiters:
+                        yield event, waiter
+
+    def add(self, event: str, check: Filter) -> _Waiter:
+        keys = check.keys
+        attrs = tuple(keys)
+        key = tuple(keys.values()) if len(attrs) != 1 else keys[attrs[0]]
+
+        groups = self._events.setdefault(event, {})
+        if attrs not in groups:
+            getter = attrgetter(*attrs) if attrs else (lambda interaction: ())
+            groups[attrs] = (getter, {})
+
+        index = groups[attrs][1]
+        waiter = _Waiter(
+            get_event_loop().create_future(),
+            None if check.exact else check.compile(),
+            index,
+            key,
+        )
+        index.setdefault(key, []).append(waiter)
+        self._count += 1
+        return waiter
+
+    def remove(self, waiter: _Waiter):
+        waiters = waiter._index.get(waiter._key)
+        if not waiters or waiter not in waiters:
+            return
+
+        waiters.remove(waiter)
+        if not waiters:
+            del waiter._index[waiter._key]
+        self._count -= 1
+
+    def resolve(self, event: str, interaction) -> int:
+        groups = self._events.get(event)
+        if not groups:
+            return 0
+
+        resolved = 0
+        for getter, index in groups.values():
+            waiters = index.get(getter(interaction))
+            if not waiters:
+                continue
+
+            for waiter in list(waiters):
+                if waiter.future.done():
+                    continue
+
+                if waiter.predicate is not None:
+                    try:
+                        if not waiter.predicate(interaction):
+                            continue
+                    except Exception as e:
+                        waiter.future.set_exception(e)
+                        self.remove(waiter)
+                        continue
+
+                waiter.future.set_result(interaction)
+                self.remove(waiter)
+                resolved += 1
+
+        return resolved
@@ -0,0 +1,184 @@
+from typing import Callable, Dict, Optional
+
+import logging
+import os
+import re
+import sys
+import threading
+import traceback
+from cProfile import Profile
+from collections import deque
+from time import perf_counter
+
+
+__all__ = ("CallbackWatchdog",)
+
+
+log = logging.getLogger("discord_components.watchdog")
+
+
+class _TimedCoroutine:
+    # drives the callback's coroutine one step at a time, so the time spent inside each
+    # send() is time the event loop was blocked by this callback and nothing else
+    __slots__ = ("_coro", "_watchdog", "_profile", "blocking", "longest_step", "steps", "stack")
+
+    def __init__(self, coro, watchdog: "CallbackWatchdog", profile: Optional[Profile]):
+        self._coro = coro
+        self._watchdog = watchdog
+        self._profile = profile
+        self.blocking = 0.0
+        self.longest_step = 0.0
+        self.steps = 0
+        self.stack = None
+
+    def __await__(self):
+        coro = self._coro
+        running = self._watchdog._running
+        ident = threading.get_ident()
+        profile = self._profile
+        value = error = None
+
+        while True:
+            started = perf_counter()
+            running[ident] = (self, started)
+            if profile is not None:
+                profile.enable()
+            try:
+                if error is not None:
+                    future = coro.throw(error)
+                else:
+                    future = coro.send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                if profile is not None:
+                    profile.disable()
+                del running[ident]
+                step = perf_counter() - started
+                self.blocking += step
+                self.steps += 1
+                if step > self.longest_step:
+                    self.longest_step = step
+
+            value = error = None
+            try:
+                value = yield future
+            except BaseException as e:
+                error = e
+
+
+class CallbackWatchdog:
+    def __init__(
+        self,
+        *,
+        slow_callback: float = 1.0,
+        blocking: float = 0.1,
+        sample_interval: Optional[float] = 0.05,
+        route: Callable[["Interaction"], str] = None,
+        profile_dir: str = ".",
+        history: int = 100,
+    ):
+        self.slow_callback = slow_callback
+        self.blocking = blocking
+        self.sample_interval = sample_interval
+        self.route = route or (lambda interaction: interaction.custom_id)
+        self.profile_dir = profile_dir
+
+        self.calls = 0
+        self.slow = 0
+        self.reports = deque(maxlen=history)
+
+        self._armed: Dict[str, int] = {}
+        self._running: Dict[int, tuple] = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def arm(self, route: str, count: int = 1):
+        self._armed[route] = self._armed.get(route, 0) + count
+
+    def disarm(self, route: str):
+        self._armed.pop(route, None)
+
+    @property
+    def armed(self) -> Dict[str, int]:
+        return dict(self._armed)
+
+    def start(self):
+        if self.sample_interval is None or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._sample, name="discord_components-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _sample(self):
+        # a blocked loop can't report on itself, so grab its stack from here while it's stuck
+        while not self._stop.wait(self.sample_interval):
+            now = perf_counter()
+            for ident, (timed, started) in list(self._running.items()):
+                if timed.stack is None and now - started >= self.blocking:
+                    frame = sys._current_frames().get(ident)
+                    if frame is not None:
+                        timed.stack = "".join(traceback.format_stack(frame))
+
+    def _take_profile(self, route: str) -> Optional[Profile]:
+        remaining = self._armed.get(route)
+        if not remaining:
+            return None
+        if remaining == 1:
+            del self._armed[route]
+        else:
+            self._armed[route] = remaining - 1
+        return Profile()
+
+    async def run(self, callback, interaction):
+        if self._thread is None and not self._stop.is_set():
+            self.start()
+
+        route = self.route(interaction)
+        profile = self._take_profile(route)
+        timed = _TimedCoroutine(callback(interaction), self, profile)
+        started = perf_counter()
+        try:
+            return await timed
+        finally:
+            self._finish(route, interaction, timed, perf_counter() - started, profile)
+
+    def _finish(self, route, interaction, timed: _TimedCoroutine, wall: float, profile):
+        self.calls += 1
+        report = None
+
+        if profile is not None:
+            name = re.sub(r"[^\w.-]", "_", route)[:64]
+            path = os.path.join(self.profile_dir, f"{name}-{interaction.interaction_id}.pstats")
+            profile.dump_stats(path)
+            log.info("profiled %s (interaction %s) to %s", route, interaction.interaction_id, path)
+
+        if wall >= self.slow_callback or timed.longest_step >= self.blocking:
+            self.slow += 1
+            report = {
+                "route": route,
+                "interaction_id": interaction.interaction_id,
+                "wall": wall,
+                "blocking": timed.blocking,
+                "longest_step": timed.longest_step,
+                "steps": timed.steps,
+                "stack": timed.stack,
+            }
+            self.reports.append(report)
+            log.warning(
+                "slow callback for %s (interaction %s): %.3fs wall, %.3fs blocking the loop, "
+                "longest step %.3fs%s",
+                route,
+                interaction.interaction_id,
+                wall,
+                timed.blocking,
+                timed.longest_step,
+                f"\n{timed.stack}" if timed.stack else "",
+            )
+        return report
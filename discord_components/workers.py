@@ -0,0 +1,156 @@
+from typing import Callable, List
+
+import multiprocessing
+from asyncio import ensure_future, get_event_loop, new_event_loop, set_event_loop, iscoroutine
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+from zlib import crc32
+
+from discord import Client, ClientUser
+from discord.http import Route
+
+
+__all__ = ("ProcessPool",)
+
+
+def _worker_main(queue, token: str, api_base: str, setup: Callable):
+    loop = new_event_loop()
+    set_event_loop(loop)
+    loop.run_until_complete(_worker(queue, token, api_base, setup))
+
+
+async def _worker(queue, token: str, api_base: str, setup: Callable):
+    from .client import DiscordComponents
+
+    Route.BASE = api_base
+    client = Client()
+    # no gateway connection here: just enough state to build interactions and answer them
+    data = await client.http.static_login(token, bot=True)
+    client._connection.user = ClientUser(state=client._connection, data=data)
+
+    manager = DiscordComponents(client)
+    result = setup(manager)
+    if iscoroutine(result):
+        await result
+
+    loop = get_event_loop()
+    # a thread of its own: parked in queue.get() it would otherwise hold one of the default
+    # executor's threads that aiohttp needs for DNS lookups
+    reader = ThreadPoolExecutor(1, thread_name_prefix="discord_components-queue")
+    running = set()
+
+    async def handle(res: dict, received_at: float):
+        try:
+            # through _intake, so a Backpressure set up in the worker admits what it releases
+            await manager._intake(res, received_at)
+        except Exception:
+            await client.on_error("socket_response", res)
+
+    try:
+        while True:
+            items = [await loop.run_in_executor(reader, queue.get)]
+            # take whatever else is already waiting without another thread hop each
+            try:
+                while len(items) < 256:
+                    items.append(queue.get_nowait())
+            except Empty:
+                pass
+
+            for item in items:
+                if item is None:
+                    return
+                task = ensure_future(handle(*item))
+                running.add(task)
+                task.add_done_callback(running.discard)
+    finally:
+        for task in list(running):
+            await task
+        reader.shutdown(wait=False)
+        await client.http.close()
+
+
+class ProcessPool:
+    # hands every click to one of `processes` workers, each with a DiscordComponents of its
+    # own set up by setup(manager). limits that come with it:
+    # - a worker has no gateway connection, so no guild or channel cache: interaction.user
+    #   is a User, never a Member, and interaction.guild and interaction.channel are None
+    # - the parent only forwards; its views, add_callback, wait_for and on_button_click style
+    #   listeners never see a click, so the parent manager refuses the first three
+    def __init__(self, setup: Callable, *, processes: int = None, context: str = "spawn"):
+        # setup(manager) runs in every worker to register callbacks, so it has to be
+        # importable by reference, i.e. a module-level function
+        self.setup = setup
+        self.processes = processes or multiprocessing.cpu_count()
+        self._context = multiprocessing.get_context(context)
+
+        self._bot = None
+        self._queues = []
+        self._workers: List[multiprocessing.Process] = []
+        self.submitted = [0] * self.processes
+        self.restarts = 0
+
+    def bind(self, manager):
+        self._bot = manager.bot
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self):
+        # DiscordComponents calls this on READY so workers have booted before the first click
+        if self._workers:
+            return
+
+        self._queues = [self._context.Queue() for _ in range(self.processes)]
+        self._workers = [self._spawn(i) for i in range(self.processes)]
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self._queues[index], self._bot.http.token, Route.BASE, self.setup),
+            name=f"discord_components-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def worker_for(self, message_id: str) -> int:
+        # every click on a message lands on the same worker, so whatever state that worker
+        # keeps for the message (views, wait_for, caches) sees all of them
+        return crc32(str(message_id).encode()) % self.processes
+
+    def submit(self, res: dict, received_at: float):
+        if not self._workers:
+            self.start()
+
+        index = self.worker_for(res["d"]["message"]["id"])
+        if not self._workers[index].is_alive():
+            self._workers[index] = self._spawn(index)
+            self.restarts += 1
+
+        self._queues[index].put((res, received_at))
+        self.submitted[index] += 1
+
+    def close(self, timeout: float = 5.0):
+        for queue in self._queues:
+            queue.put(None)
+        for process in self._workers:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for queue in self._queues:
+            queue.close()
+
+        self._workers = []
+        self._queues = []
+
+    @property
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "pid": process.pid,
+                "alive": process.is_alive(),
+                "submitted": self.submitted[index],
+            }
+            for index, process in enumerate(self._workers)
+        ]
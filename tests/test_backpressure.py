@@ -0,0 +1,51 @@
+import pytest
+
+from discord_components import Backpressure
+
+
+def test_sheds_from_high_until_drained_to_low():
+    backpressure = Backpressure(high=4, low=2)
+    assert all(backpressure.admit() for _ in range(4))
+    assert not backpressure.admit()
+    assert backpressure.shedding
+
+    # still above the low watermark, so keep shedding
+    backpressure.release()
+    assert not backpressure.admit()
+
+    backpressure.release()
+    assert not backpressure.shedding
+    assert backpressure.admit()
+    assert backpressure.stats == {
+        "in_flight": 3,
+        "peak": 4,
+        "shedding": False,
+        "admitted": 5,
+        "shed": 2,
+        "episodes": 1,
+    }
+
+
+def test_each_overload_counts_as_one_episode():
+    backpressure = Backpressure(high=1, low=0)
+    for _ in range(2):
+        assert backpressure.admit()
+        assert not backpressure.admit()
+        assert not backpressure.admit()
+        backpressure.release()
+    assert backpressure.episodes == 2
+    assert backpressure.shed == 4
+
+
+def test_low_defaults_to_three_quarters_of_high():
+    assert Backpressure(high=100).low == 75
+    with pytest.raises(ValueError):
+        Backpressure(high=4, low=4)
+
+
+def test_response_defers_unless_a_busy_message_is_set():
+    assert Backpressure().response == {"type": 6}
+    assert Backpressure(busy_message="Busy").response == {
+        "type": 4,
+        "data": {"content": "Busy", "flags": 64},
+    }
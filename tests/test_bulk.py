@@ -0,0 +1,63 @@
+import sys
+from asyncio import new_event_loop
+from os import path
+
+from discord import Object
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from run import make_manager  # noqa: E402
+
+from discord_components import LayoutCache  # noqa: E402
+from discord_components.bulk import (  # noqa: E402
+    _components_disabled,
+    _edit_bucket,
+    disable_components_bulk,
+)
+
+
+def clicked(manager):
+    raw = payloads.interaction_payload(custom_id="a")
+    interaction = manager._get_interaction(payloads.gateway_event(raw))
+    interaction.message.channel = Object(id=payloads.CHANNEL_ID)
+    return interaction
+
+
+def test_webhook_edits_are_bucketed_per_token():
+    manager = make_manager()
+    first, second = clicked(manager).message, clicked(manager).message
+    assert _edit_bucket(first) == ("channel", payloads.CHANNEL_ID)
+
+    first._bind_interaction("token-1")
+    second._bind_interaction("token-2")
+    assert _edit_bucket(first) != _edit_bucket(second)
+
+
+def test_components_without_disabled_key_are_enabled():
+    manager = make_manager(layout_cache=LayoutCache())
+    message = clicked(manager).message
+    layout = [{"type": 1, "components": [{"type": 2, "style": 1, "custom_id": "a"}]}]
+    manager.layouts.put(message.id, layout, message._edited_timestamp)
+    assert not _components_disabled(message)
+
+
+def test_every_error_is_reported_per_message():
+    manager = make_manager()
+    calls = []
+
+    async def request(route, **kwargs):
+        calls.append(route)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    manager.bot.http.request = request
+    messages = [clicked(manager).message for _ in range(2)]
+    loop = new_event_loop()
+    try:
+        report = loop.run_until_complete(disable_components_bulk(messages))
+    finally:
+        loop.close()
+
+    assert [result["status"] for result in report["results"]] == ["failed", "edited"]
+    assert isinstance(report["results"][0]["error"], RuntimeError)
@@ -0,0 +1,70 @@
+from asyncio import new_event_loop
+
+import pytest
+
+from discord_components import InteractionDeduplicator
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_repeats_inside_the_window_are_duplicates():
+    dedup = InteractionDeduplicator(size=8, window=10.0)
+    assert not dedup._check_local("1", 0.0)
+    assert dedup._check_local("1", 5.0)
+    assert not dedup._check_local("1", 20.0)
+
+
+def test_ring_forgets_the_oldest_ids():
+    dedup = InteractionDeduplicator(size=2, window=60.0)
+    for interaction_id in ("1", "2", "3"):
+        assert not dedup._check_local(interaction_id, 0.0)
+
+    assert len(dedup) == 2
+    assert not dedup._check_local("1", 1.0)
+    assert dedup._check_local("3", 1.0)
+
+
+def test_a_re_seen_id_survives_its_old_ring_slot():
+    dedup = InteractionDeduplicator(size=2, window=1.0)
+    dedup._check_local("1", 0.0)
+    dedup._check_local("1", 5.0)
+    # evicts the first ("1", 0.0) entry, which no longer is the one on record
+    dedup._check_local("2", 5.0)
+    assert dedup._check_local("1", 5.5)
+
+
+class Backend:
+    def __init__(self, *, fail: bool = False):
+        self.fail = fail
+        self.seen = set()
+
+    async def add(self, interaction_id: str, ttl: float) -> bool:
+        if self.fail:
+            raise ConnectionError("backend down")
+        if interaction_id in self.seen:
+            return False
+        self.seen.add(interaction_id)
+        return True
+
+
+def test_backend_catches_what_another_process_saw(loop):
+    backend = Backend()
+    first = InteractionDeduplicator(backend=backend)
+    second = InteractionDeduplicator(backend=backend)
+
+    assert not loop.run_until_complete(first.is_duplicate("1"))
+    assert loop.run_until_complete(second.is_duplicate("1"))
+    assert second.duplicates == 1
+
+
+def test_backend_errors_count_as_new(loop):
+    dedup = InteractionDeduplicator(backend=Backend(fail=True))
+    assert not loop.run_until_complete(dedup.is_duplicate("1"))
+    assert dedup.backend_errors == 1
+    # the local ring still has it
+    assert loop.run_until_complete(dedup.is_duplicate("1"))
@@ -0,0 +1,99 @@
+import sys
+from asyncio import new_event_loop
+from os import path
+
+import pytest
+from discord import Object
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from run import make_manager  # noqa: E402
+
+from discord_components import Button, ComponentMessage  # noqa: E402
+from discord_components.utils import _get_components_json  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def click(loop, skip_unchanged_edits: bool):
+    manager = make_manager(skip_unchanged_edits=skip_unchanged_edits)
+    message = {
+        **payloads.message_payload(buttons=1),
+        "content": "page 1",
+        "components": _get_components_json([Button(label="a", custom_id="a")]),
+    }
+    requests = []
+
+    async def request(route, **kwargs):
+        requests.append((route.method, route.path.split("/")[1]))
+        return message if route.method == "PATCH" else None
+
+    manager.bot.http.request = request
+    interaction = manager._get_interaction(
+        payloads.gateway_event(payloads.interaction_payload(message=message, custom_id="a"))
+    )
+    interaction.message.channel = Object(id=payloads.CHANNEL_ID)
+    result = loop.run_until_complete(
+        interaction.edit_origin(content="page 1", components=[Button(label="a", custom_id="a")])
+    )
+    return manager, interaction, requests, result
+
+
+def test_unchanged_edit_is_sent_by_default(loop):
+    manager, interaction, requests, result = click(loop, False)
+    assert requests == [("POST", "interactions"), ("PATCH", "webhooks")]
+    assert isinstance(result, ComponentMessage)
+    assert manager.fingerprints is None
+
+
+def test_unchanged_edit_is_skipped_when_enabled(loop):
+    manager, interaction, requests, result = click(loop, True)
+    assert requests == [("POST", "interactions")]
+    assert interaction.responded
+    assert result is interaction.message
+    assert manager.fingerprints.stats["skipped"] == 1
+
+
+def test_managers_keep_their_own_setting(loop):
+    click(loop, True)
+    manager, _, requests, _ = click(loop, False)
+    assert manager.fingerprints is None
+    assert ("PATCH", "webhooks") in requests
+
+
+def test_layout_cache_yields_to_edits_made_elsewhere(loop):
+    from discord_components import LayoutCache
+
+    manager = make_manager(layout_cache=LayoutCache())
+    message = payloads.message_payload(buttons=1)
+    components = _get_components_json([[Button(label="a", custom_id="a")]])
+    edited_at = "2021-01-01T00:01:00+00:00"
+
+    async def request(route, **kwargs):
+        data = {"components": kwargs["json"]["components"], "edited_timestamp": edited_at}
+        return {**message, **data}
+
+    manager.bot.http.request = request
+
+    def clicked(**fields):
+        raw = payloads.interaction_payload(
+            message={**message, "components": components, **fields}, custom_id="a"
+        )
+        interaction = manager._get_interaction(payloads.gateway_event(raw))
+        interaction.message.channel = Object(id=payloads.CHANNEL_ID)
+        return interaction
+
+    loop.run_until_complete(clicked().message.update_component("a", label="A"))
+
+    def labels(interaction):
+        return [c["label"] for row in interaction.message._layout() for c in row["components"]]
+
+    assert labels(clicked(edited_timestamp=edited_at)) == ["A"]
+    assert labels(clicked(edited_timestamp="2021-01-01T00:02:00+00:00")) == ["a"]
+    assert make_manager().layouts is None
@@ -0,0 +1,103 @@
+import sys
+import warnings
+from asyncio import new_event_loop
+from os import path
+from time import monotonic
+
+import pytest
+import discord
+from aiohttp import ClientError
+from discord import HTTPException, NotFound
+from discord.http import Route
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from fake_discord import API, FakeDiscord  # noqa: E402
+
+from discord_components.http import HTTPClient  # noqa: E402
+
+
+@pytest.fixture
+def env():
+    loop = new_event_loop()
+    fake = FakeDiscord()
+    base = Route.BASE
+    Route.BASE = loop.run_until_complete(fake.start()) + API
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        client = discord.Client(loop=loop)
+    data = loop.run_until_complete(client.http.static_login("token", bot=True))
+    client._connection.user = discord.ClientUser(state=client._connection, data=data)
+
+    yield loop, fake, HTTPClient(client, retry_delay=0.01)
+
+    loop.run_until_complete(client.http.close())
+    loop.run_until_complete(fake.close())
+    Route.BASE = base
+    loop.close()
+
+
+def respond(loop, http, data, deadline=None):
+    interaction_id = payloads.snowflake()
+    result = loop.run_until_complete(
+        http.initial_response(
+            interaction_id=interaction_id,
+            interaction_token=f"token-{interaction_id}",
+            data=data,
+            deadline=deadline,
+        )
+    )
+    return interaction_id, result
+
+
+MESSAGE = {"type": 4, "data": {"content": "hi", "tts": False}}
+
+
+def test_retries_server_errors(env):
+    loop, fake, http = env
+    fake.inject("interaction_callback", "503", "503")
+
+    interaction_id, _ = respond(loop, http, {"type": 6})
+    assert interaction_id in fake.callbacks
+    assert fake.errors == 2
+
+
+def test_server_errors_raise_without_editing_original(env):
+    loop, fake, http = env
+    fake.inject("interaction_callback", *["503"] * (http.max_retries + 1))
+
+    with pytest.raises(HTTPException) as info:
+        respond(loop, http, MESSAGE)
+    # nothing landed, so there is no @original to fall back on: the 503 is what surfaces
+    assert info.value.status == 503
+    assert not isinstance(info.value, NotFound)
+    assert not fake.callbacks
+
+
+def test_dropped_response_counts_as_acknowledged(env):
+    loop, fake, http = env
+    fake.inject("interaction_callback", "ack-reset")
+
+    interaction_id, result = respond(loop, http, {"type": 6})
+    assert result is None
+    assert list(fake.callbacks) == [interaction_id]
+
+
+def test_timeout_after_landing_falls_back_to_original(env):
+    loop, fake, http = env
+    fake.inject("interaction_callback", "ack-hang", hang=5.0)
+
+    interaction_id, result = respond(loop, http, MESSAGE, deadline=monotonic() + 0.3)
+    assert interaction_id in fake.callbacks
+    assert result["content"] == "hi"
+
+
+def test_failed_fallback_raises_original_error(env):
+    loop, fake, http = env
+    fake.inject("interaction_callback", *["reset"] * (http.max_retries + 1), hang=0.1)
+
+    with pytest.raises(ClientError):
+        respond(loop, http, MESSAGE)
+    assert not fake.callbacks
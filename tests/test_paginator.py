@@ -0,0 +1,13 @@
+from discord_components import Paginator
+from discord_components.utils import _get_components_json
+
+
+def test_renders_of_a_page_are_identical():
+    paginator = Paginator(None, ["a", "b", "c"], custom_id="pages")
+    first, second = (_get_components_json(paginator.get_components(1)) for _ in range(2))
+    assert first == second
+    assert [button["custom_id"] for button in first[0]["components"]] == [
+        "pages:prev",
+        "pages:label",
+        "pages:next",
+    ]
@@ -0,0 +1,38 @@
+import sys
+from asyncio import new_event_loop
+from io import BytesIO
+from os import path
+
+import pytest
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from run import make_manager  # noqa: E402
+
+from discord_components import InteractionRecorder, read_recording  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_records_the_events_asked_for_and_flushes_when_the_bot_closes(loop):
+    file = BytesIO()
+    recorder = InteractionRecorder(file, anonymize=False, events=("MESSAGE_CREATE",))
+    manager = make_manager(recorder=recorder)
+
+    async def scenario():
+        await manager.on_socket_response({"op": 0, "t": "MESSAGE_CREATE", "s": 1, "d": {}})
+        await manager.on_socket_response(
+            payloads.gateway_event(payloads.interaction_payload(), seq=2)
+        )
+        await manager.bot.close()
+
+    loop.run_until_complete(scenario())
+    assert recorder.closed
+    file.seek(0)
+    assert [record["t"] for _, record in read_recording(file)] == ["MESSAGE_CREATE"]
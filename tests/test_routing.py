@@ -0,0 +1,66 @@
+import sys
+from asyncio import new_event_loop, sleep
+from os import path
+
+import pytest
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from run import make_manager  # noqa: E402
+
+from discord_components import Button, InMemoryRouter  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_router_starts_without_ready(loop):
+    # neither manager sees READY, as when they are created after the bot connected
+    nodes = {}
+
+    async def scenario():
+        first = make_manager(router=InMemoryRouter("first", nodes))
+        first.add_callback(Button(label="a", custom_id="a"), lambda interaction: None)
+        await first.router.start()
+        assert first.router.started
+
+        delivered = []
+
+        async def intake(res, received_at):
+            delivered.append(res["d"]["data"]["custom_id"])
+
+        first._intake = intake
+
+        # "a" was advertised before this node existed; the first click syncs it
+        second = make_manager(router=InMemoryRouter("second", nodes))
+        res = payloads.gateway_event(payloads.interaction_payload(custom_id="a"))
+        assert await second.router.route(res, 0.0)
+        assert second.router.started
+        await sleep(0)
+        return delivered
+
+    assert loop.run_until_complete(scenario()) == ["a"]
+
+
+def test_start_is_shared(loop):
+    router = InMemoryRouter("only", {})
+    make_manager(router=router)
+    calls = []
+
+    async def sync():
+        calls.append(None)
+
+    router._sync = sync
+
+    async def scenario():
+        router.advertise("a")
+        router.advertise("b")
+        await router.start()
+
+    loop.run_until_complete(scenario())
+    assert calls == [None]
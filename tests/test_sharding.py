@@ -0,0 +1,68 @@
+import sys
+from asyncio import new_event_loop, sleep
+from os import path
+
+import pytest
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+import payloads  # noqa: E402
+from run import make_manager  # noqa: E402
+
+from discord_components import Backpressure, ShardScheduler  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def event(custom_id: str) -> dict:
+    return payloads.gateway_event(payloads.interaction_payload(custom_id=custom_id))
+
+
+def test_unpin_hands_queued_clicks_to_a_running_lane(loop):
+    shards = ShardScheduler(workers=1)
+    make_manager(shards=shards)
+    handled = []
+
+    async def scenario():
+        gate = loop.create_future()
+
+        async def handler(res, received_at):
+            handled.append(res["d"]["data"]["custom_id"])
+            if len(handled) == 1:
+                await gate
+
+        shards._handler = handler
+        # the shared lane has never seen a submit, so it has no workers yet
+        shards.pin(0)
+        shards.submit(event("a"), 0.0)
+        shards.submit(event("b"), 0.0)
+        await sleep(0)
+        shards.unpin(0)
+        for _ in range(3):
+            await sleep(0)
+        assert handled == ["a", "b"]
+        gate.set_result(None)
+        await sleep(0)
+        shards.close()
+
+    loop.run_until_complete(scenario())
+
+
+def test_close_gives_back_slots_of_queued_clicks(loop):
+    backpressure = Backpressure(high=10)
+    shards = ShardScheduler(workers=1)
+    make_manager(shards=shards, backpressure=backpressure)
+
+    async def scenario():
+        for custom_id in ("a", "b", "c"):
+            assert backpressure.admit()
+            shards.submit(event(custom_id), 0.0)
+        shards.close()
+
+    loop.run_until_complete(scenario())
+    assert backpressure.in_flight == 0
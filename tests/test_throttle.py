@@ -0,0 +1,40 @@
+import pytest
+
+from discord_components import ClickThrottle
+
+
+def test_debounce_drops_clicks_too_close_to_the_last_accepted_one():
+    throttle = ClickThrottle(debounce=0.5)
+    assert throttle.check("key", 0.0) is None
+    assert throttle.check("key", 0.3) == "debounced"
+    assert throttle.check("other", 0.3) is None
+    assert throttle.check("key", 0.6) is None
+    assert throttle.stats["debounced"] == 1
+
+
+def test_rate_refills_over_time():
+    throttle = ClickThrottle(rate=2, per=1.0)
+    assert throttle.check("key", 0.0) is None
+    assert throttle.check("key", 0.0) is None
+    assert throttle.check("key", 0.1) == "throttled"
+    # half a second earns one more click
+    assert throttle.check("key", 0.6) is None
+    assert throttle.check("key", 0.6) == "throttled"
+    assert throttle.throttled == 2
+    assert throttle.shed == 2
+
+
+def test_only_max_keys_are_tracked():
+    throttle = ClickThrottle(debounce=10.0, max_keys=2)
+    for key in ("a", "b", "c"):
+        throttle.check(key, 0.0)
+
+    assert throttle.stats["tracked_keys"] == 2
+    # "a" was evicted, so it starts over
+    assert throttle.check("a", 1.0) is None
+    assert throttle.check("c", 1.0) == "debounced"
+
+
+def test_rate_and_per_go_together():
+    with pytest.raises(ValueError):
+        ClickThrottle(rate=5)
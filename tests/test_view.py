@@ -0,0 +1,85 @@
+from asyncio import new_event_loop
+from time import monotonic
+from types import SimpleNamespace
+
+import pytest
+
+from discord_components.timer import TimingWheel
+from discord_components.view import View, ViewStore
+
+
+@pytest.fixture
+def loop():
+    loop = new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_wheel_expires_in_order():
+    wheel = TimingWheel(tick=0.01, slots=8, levels=3)
+    now = monotonic()
+    for delay in (0.5, 0.05, 3.0):
+        wheel.schedule(delay, delay)
+
+    assert wheel.advance(now + 0.2) == [0.05]
+    assert wheel.advance(now + 1.0) == [0.5]
+    assert len(wheel) == 1
+    assert wheel.advance(now + 4.0) == [3.0]
+    assert not wheel
+
+
+def test_wheel_cancel_and_reschedule():
+    wheel = TimingWheel(tick=0.01, slots=8)
+    now = monotonic()
+    wheel.schedule("a", 0.05)
+    wheel.schedule("b", 0.05)
+    assert wheel.cancel("a")
+    assert not wheel.cancel("a")
+
+    wheel.schedule("b", 1.0)
+    assert wheel.advance(now + 0.5) == []
+    assert "b" in wheel
+    assert wheel.advance(now + 1.5) == ["b"]
+
+
+def run(loop, coro_fn):
+    async def main():
+        store = ViewStore(tick=0.01, slots=8)
+        try:
+            return coro_fn(store)
+        finally:
+            if store._task is not None:
+                store._task.cancel()
+
+    return loop.run_until_complete(main())
+
+
+def test_view_expires(loop):
+    def check(store):
+        view = View(timeout=0.05, disable_on_timeout=False)
+        store.add(view, SimpleNamespace(id=1))
+        store._expire(store._wheel.advance(monotonic() + 1.0))
+        assert store.get(1) is None
+        assert not view.active
+
+    run(loop, check)
+
+
+def test_replaced_view_does_not_evict_its_successor(loop):
+    def check(store):
+        message = SimpleNamespace(id=1)
+        old = View(timeout=0.05, disable_on_timeout=False)
+        new = View(timeout=60, disable_on_timeout=False)
+        store.add(old, message)
+        store.add(new, message)
+        assert not old.active
+
+        store._expire(store._wheel.advance(monotonic() + 1.0))
+        assert store.get(1) is new
+
+        old.stop()
+        assert store.get(1) is new
+        new.stop()
+        assert store.get(1) is None
+
+    run(loop, check)
@@ -0,0 +1,29 @@
+import sys
+from asyncio import new_event_loop
+from os import path
+
+import pytest
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks"))
+
+from run import make_manager  # noqa: E402
+
+from discord_components import Button, ProcessPool  # noqa: E402
+
+
+def setup(manager):
+    pass
+
+
+def test_parent_refuses_what_only_workers_would_see():
+    manager = make_manager(workers=ProcessPool(setup, processes=1))
+    with pytest.raises(ValueError):
+        manager.add_callback(Button(label="a", custom_id="a"), lambda interaction: None)
+
+    loop = new_event_loop()
+    try:
+        with pytest.raises(ValueError):
+            loop.run_until_complete(manager.wait_for("button_click", timeout=0))
+    finally:
+        loop.close()
+    assert not manager.workers.started